@@ -0,0 +1,570 @@
+"""Read-only HTTP/JSON query service over mtg.db for other services.
+
+Standard library only: an asyncio HTTP/1.1 server (keep-alive, chunked
+streaming) in front of a pool of read-only SQLite connections. Responses carry
+an ETag built from the database's build id (written by build_db.py), so
+clients can revalidate with If-None-Match, and small responses are cached in
+memory until the next build. Run several worker processes to use more cores;
+they share the port via SO_REUSEPORT.
+
+Endpoints:
+    GET  /health
+    GET  /cards/{id}
+    GET  /cards?ids=id1,id2,...          batch lookup (up to MAX_BATCH ids)
+    POST /cards  {"ids": [...]}          batch lookup with a JSON body
+    GET  /cards/named?exact=Name         newest printing with this exact name
+    GET  /cards/named?fuzzy=Nam          newest printing whose name starts with this
+    GET  /search?q=draw&field=oracle_text&limit=100&offset=0   streamed results
+    GET  /decks/{deck_id}                Moxfield deck JSON plus deck_stats
+    GET  /decks?username=name            deck summaries
+
+Usage:
+    python api_server.py --port 8600 --workers 4
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+DB_PATH = "mtg.db"
+DEFAULT_PORT = 8600
+MAX_BATCH = 500
+MAX_SEARCH_LIMIT = 1000
+# Rows fetched per chunk when streaming
+STREAM_BATCH = 200
+# Responses larger than this are not kept in the response cache
+CACHE_MAX_BODY = 256 * 1024
+CACHE_MAX_ENTRIES = 5000
+# How often to re-read the build id to notice a rebuild
+BUILD_CHECK_SECONDS = 2.0
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+
+SEARCH_FIELDS = {
+    "name": "c.name",
+    "type_line": "c.type_line",
+    "oracle_text": "c.oracle_text",
+    "set": "c.set_code",
+    "artist": "c.artist",
+}
+
+class HTTPError(Exception):
+    """Error response with a status code and message"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class ReadPool:
+    """Fixed pool of read-only SQLite connections used from executor threads"""
+
+    def __init__(self, db_path, size):
+        self.db_path = db_path
+        self.size = size
+        self.connections = queue.Queue()
+        uri = f"file:{os.path.abspath(db_path)}?mode=ro"
+        for _ in range(size):
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON")
+            self.connections.put(conn)
+
+    def acquire(self):
+        return self.connections.get()
+
+    def release(self, conn):
+        self.connections.put(conn)
+
+    def run(self, func, *args):
+        """Call func(conn, *args) with a pooled connection"""
+        conn = self.acquire()
+        try:
+            return func(conn, *args)
+        finally:
+            self.release(conn)
+
+    def close(self):
+        while not self.connections.empty():
+            self.connections.get().close()
+
+class Response:
+    """Complete response body, or a streaming one when `chunks` is an async iterator"""
+
+    def __init__(self, status=200, body=b"", chunks=None, cacheable=True):
+        self.status = status
+        self.body = body
+        self.chunks = chunks
+        self.cacheable = cacheable
+
+def json_response(obj, status=200):
+    return Response(status, json.dumps(obj, separators=(",", ":")).encode("utf-8"))
+
+def raw_json_response(text, status=200):
+    """Response from JSON text that is already serialized (e.g. cards_raw.json)"""
+    return Response(status, text.encode("utf-8"))
+
+# --- queries (run in executor threads with a pooled connection) ---
+
+def q_build_id(conn, db_path):
+    """Version of the data: the build id, plus when deck stats last changed"""
+    try:
+        row = conn.execute("SELECT value FROM build_info WHERE key = 'build_id'").fetchone()
+        build_id = row[0] if row else None
+    except sqlite3.OperationalError:
+        build_id = None
+    if build_id is None:
+        # Databases built before build_info existed: fall back to the file's identity
+        stat = os.stat(db_path)
+        build_id = f"{stat.st_size:x}-{int(stat.st_mtime):x}"
+    try:
+        # moxfield_pull.py updates decks between builds and refreshes deck_stats when it does
+        decks_at = conn.execute("SELECT MAX(computed_at) FROM deck_stats").fetchone()[0]
+    except sqlite3.OperationalError:
+        decks_at = None
+    if decks_at:
+        build_id += "." + hashlib.sha1(decks_at.encode("utf-8")).hexdigest()[:6]
+    return build_id
+
+def q_card(conn, card_id):
+    row = conn.execute("SELECT json FROM cards_raw WHERE id = ?", (card_id,)).fetchone()
+    return row[0] if row else None
+
+def q_cards(conn, ids):
+    rows = conn.execute("""
+        SELECT id, json FROM cards_raw WHERE id IN (SELECT value FROM json_each(?))
+    """, (json.dumps(ids),)).fetchall()
+    return dict(rows)
+
+def q_named(conn, name, exact):
+    if exact:
+        where, param = "c.name = ? COLLATE NOCASE", name
+    else:
+        where, param = "c.name LIKE ?", name.replace("%", "").replace("_", "") + "%"
+    row = conn.execute(f"""
+        SELECT r.json FROM cards c JOIN cards_raw r ON r.id = c.card_id
+        WHERE {where}
+        ORDER BY c.released_at DESC
+        LIMIT 1
+    """, (param,)).fetchone()
+    return row[0] if row else None
+
+def q_deck(conn, deck_id):
+    row = conn.execute("SELECT username, data FROM moxfield_raw WHERE deck_id = ?", (deck_id,)).fetchone()
+    if not row:
+        return None, None
+    stats = None
+    try:
+        cur = conn.execute("SELECT * FROM deck_stats WHERE deck_id = ?", (deck_id,))
+        stats_row = cur.fetchone()
+        if stats_row:
+            stats = dict(zip([d[0] for d in cur.description], stats_row))
+    except sqlite3.OperationalError:
+        pass
+    return row, stats
+
+def q_decks(conn, username):
+    try:
+        cur = conn.execute("""
+            SELECT deck_id, username, deck_name, format, card_count, colors, total_price_usd, is_legal
+            FROM deck_stats WHERE (? IS NULL OR username = ?) ORDER BY deck_name
+        """, (username, username))
+    except sqlite3.OperationalError:
+        cur = conn.execute("""
+            SELECT deck_id, username, json_extract(data, '$.name') AS deck_name,
+                   json_extract(data, '$.format') AS format
+            FROM moxfield_raw WHERE (? IS NULL OR username = ?) ORDER BY deck_name
+        """, (username, username))
+    columns = [d[0] for d in cur.description]
+    return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+class QueryService:
+    """Routes requests to queries, with build-versioned ETags and response caching"""
+
+    def __init__(self, db_path, pool_size):
+        self.db_path = db_path
+        self.pool = ReadPool(db_path, pool_size)
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="db")
+        # Waiting for a free connection happens here, on the event loop, never in an
+        # executor thread (a streaming response holds its connection between batches)
+        self.slots = asyncio.Semaphore(pool_size)
+        self.cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.build_id = None
+        self.build_checked = 0.0
+        self.stats = {"requests": 0, "cache_hits": 0, "not_modified": 0}
+
+    async def db(self, func, *args):
+        loop = asyncio.get_running_loop()
+        async with self.slots:
+            return await loop.run_in_executor(self.executor, self.pool.run, func, *args)
+
+    async def current_build(self):
+        """Build id of the database, re-read at most every BUILD_CHECK_SECONDS"""
+        now = time.monotonic()
+        if self.build_id is None or now - self.build_checked > BUILD_CHECK_SECONDS:
+            build_id = await self.db(q_build_id, self.db_path)
+            if build_id != self.build_id:
+                with self.cache_lock:
+                    self.cache.clear()
+                self.build_id = build_id
+            self.build_checked = now
+        return self.build_id
+
+    def etag(self, build_id, method, target, body):
+        digest = hashlib.sha1(f"{method} {target}".encode("utf-8") + body).hexdigest()[:16]
+        return f'"{build_id}-{digest}"'
+
+    async def handle(self, method, target, headers, body):
+        """Return (Response, etag) for a request"""
+        self.stats["requests"] += 1
+        build_id = await self.current_build()
+        etag = self.etag(build_id, method, target, body)
+
+        if etag in (headers.get("if-none-match") or "").replace(" ", "").split(","):
+            self.stats["not_modified"] += 1
+            return Response(HTTPStatus.NOT_MODIFIED), etag
+
+        with self.cache_lock:
+            cached = self.cache.get(etag)
+            if cached is not None:
+                self.cache.move_to_end(etag)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached, etag
+
+        response = await self.route(method, target, body)
+        if response.status == 200 and response.chunks is None and response.cacheable \
+                and len(response.body) <= CACHE_MAX_BODY:
+            with self.cache_lock:
+                self.cache[etag] = response
+                while len(self.cache) > CACHE_MAX_ENTRIES:
+                    self.cache.popitem(last=False)
+        return response, etag
+
+    async def route(self, method, target, body):
+        url = urlsplit(target)
+        path = unquote(url.path).rstrip("/") or "/"
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = path.strip("/").split("/")
+
+        if method not in ("GET", "HEAD", "POST"):
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"Method {method} not allowed")
+        if method == "POST" and path != "/cards":
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "POST is only supported on /cards")
+
+        if path == "/health":
+            resp = json_response({"status": "ok", "build_id": self.build_id, "pid": os.getpid(),
+                                  **self.stats})
+            resp.cacheable = False
+            return resp
+
+        if path == "/cards":
+            if method == "POST":
+                try:
+                    ids = json.loads(body or b"{}").get("ids", [])
+                except (ValueError, AttributeError):
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be JSON like {\"ids\": [...]}")
+            else:
+                ids = [i for i in params.get("ids", "").split(",") if i]
+            return await self.cards_batch(ids)
+
+        if path == "/cards/named":
+            if "exact" in params:
+                text = await self.db(q_named, params["exact"], True)
+            elif "fuzzy" in params:
+                text = await self.db(q_named, params["fuzzy"], False)
+            else:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Pass ?exact= or ?fuzzy=")
+            if text is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, "No card found with that name")
+            return raw_json_response(text)
+
+        if len(parts) == 2 and parts[0] == "cards":
+            text = await self.db(q_card, parts[1])
+            if text is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"No card with id {parts[1]}")
+            return raw_json_response(text)
+
+        if path == "/search":
+            return await self.search(params)
+
+        if path == "/decks":
+            decks = await self.db(q_decks, params.get("username"))
+            return json_response({"decks": decks})
+
+        if len(parts) == 2 and parts[0] == "decks":
+            row, stats = await self.db(q_deck, parts[1])
+            if row is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"No deck with id {parts[1]}")
+            username, data = row
+            text = '{"deck_id":%s,"username":%s,"stats":%s,"deck":%s}' % (
+                json.dumps(parts[1]), json.dumps(username), json.dumps(stats), data)
+            return raw_json_response(text)
+
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown endpoint {path}")
+
+    async def cards_batch(self, ids):
+        if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "ids must be a list of card id strings")
+        if len(ids) > MAX_BATCH:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"At most {MAX_BATCH} ids per request")
+        found = await self.db(q_cards, ids)
+        # Keep request order; card JSON is embedded as stored, without re-serializing
+        cards = ",".join(found[i] for i in ids if i in found)
+        missing = [i for i in ids if i not in found]
+        return raw_json_response('{"cards":[%s],"missing":%s}' % (cards, json.dumps(missing)))
+
+    async def search(self, params):
+        """Streamed search over the structured cards table"""
+        field = params.get("field", "name")
+        if field not in SEARCH_FIELDS:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"field must be one of {', '.join(SEARCH_FIELDS)}")
+        term = params.get("q", "")
+        if not term:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Pass a search term with ?q=")
+        try:
+            limit = int(params.get("limit", 100))
+            offset = int(params.get("offset", 0))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "limit and offset must be integers")
+        if limit < 0 or offset < 0:
+            # SQLite reads a negative LIMIT as no limit at all
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "limit and offset must not be negative")
+        limit = min(limit, MAX_SEARCH_LIMIT)
+
+        sql = f"""
+            SELECT c.card_id, c.name, c.mana_cost, c.type_line, c.set_code, c.rarity,
+                   c.price_usd, c.image_normal
+            FROM cards c
+            WHERE {SEARCH_FIELDS[field]} LIKE ?
+            ORDER BY c.name
+            LIMIT ? OFFSET ?
+        """
+        return await self.stream(sql, (f"%{term}%", limit, offset))
+
+    async def stream(self, sql, params):
+        """Streaming Response for a query; the query has started by the time this returns,
+        so errors running it surface as an error response rather than a broken 200"""
+        chunks = self.stream_rows(sql, params)
+        # Runs up to the first (empty) yield: the statement is executed and, once the
+        # generator has started, aclose() is guaranteed to release its connection
+        await chunks.__anext__()
+        return Response(chunks=chunks)
+
+    async def stream_rows(self, sql, params):
+        """Yield a JSON document {"results": [...]} in chunks as rows are fetched"""
+        loop = asyncio.get_running_loop()
+        await self.slots.acquire()
+        conn = self.pool.acquire()
+        cur = None
+        try:
+            cur = await loop.run_in_executor(self.executor, conn.execute, sql, params)
+            columns = [d[0] for d in cur.description]
+            yield b""
+            yield b'{"results":['
+            first = True
+            while True:
+                rows = await loop.run_in_executor(self.executor, cur.fetchmany, STREAM_BATCH)
+                if not rows:
+                    break
+                parts = [json.dumps(dict(zip(columns, row)), separators=(",", ":")) for row in rows]
+                chunk = ",".join(parts)
+                yield (chunk if first else "," + chunk).encode("utf-8")
+                first = False
+            yield b"]}"
+        finally:
+            if cur is not None:
+                cur.close()
+            self.pool.release(conn)
+            self.slots.release()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.pool.close()
+
+# --- HTTP protocol ---
+
+async def write_response(writer, method, response, etag, keep_alive):
+    """Write a response; returns False if a streamed body failed and the connection must close"""
+    status = HTTPStatus(response.status)
+    headers = [
+        f"HTTP/1.1 {status.value} {status.phrase}",
+        "Content-Type: application/json; charset=utf-8",
+        "Cache-Control: no-cache",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    if etag:
+        headers.append(f"ETag: {etag}")
+
+    if response.chunks is not None:
+        headers.append("Transfer-Encoding: chunked")
+        try:
+            writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1"))
+            if method != "HEAD":
+                async for chunk in response.chunks:
+                    if chunk:
+                        writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                        await writer.drain()
+                writer.write(b"0\r\n\r\n")
+        except sqlite3.Error as e:
+            # The 200 is already sent: end the connection without the final chunk so the
+            # client sees an incomplete body rather than truncated JSON
+            print(f"Stream failed: {e}", file=sys.stderr)
+            return False
+        finally:
+            # Returns the stream's connection to the pool even if the client went away
+            await response.chunks.aclose()
+    else:
+        body = b"" if status == HTTPStatus.NOT_MODIFIED else response.body
+        headers.append(f"Content-Length: {len(body)}")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1"))
+        if method != "HEAD":
+            writer.write(body)
+    await writer.drain()
+    return True
+
+async def handle_connection(service, reader, writer):
+    """Serve requests on one keep-alive connection"""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            except asyncio.LimitOverrunError:
+                await write_response(writer, "GET", json_response({"error": "Headers too large"}, 431),
+                                     None, False)
+                break
+
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                await write_response(writer, "GET", json_response({"error": "Bad request line"}, 400),
+                                     None, False)
+                break
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+            body = b""
+            try:
+                length = int(headers.get("content-length", 0) or 0)
+                if length < 0:
+                    raise ValueError(length)
+            except ValueError:
+                await write_response(writer, method, json_response({"error": "Bad Content-Length"}, 400),
+                                     None, False)
+                break
+            if length > MAX_BODY_BYTES:
+                await write_response(writer, method, json_response({"error": "Body too large"}, 413),
+                                     None, False)
+                break
+            if length:
+                body = await reader.readexactly(length)
+
+            try:
+                response, etag = await service.handle(method, target, headers, body)
+            except HTTPError as e:
+                response, etag = json_response({"error": e.message}, e.status), None
+            except sqlite3.OperationalError as e:
+                # Locked or mid-rebuild (tables missing): worth retrying shortly
+                response, etag = json_response({"error": f"Database unavailable: {e}"}, 503), None
+            except Exception as e:
+                response, etag = json_response({"error": f"Internal error: {e}"}, 500), None
+
+            if not await write_response(writer, method, response, etag, keep_alive) or not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+def make_socket(host, port, reuse_port):
+    """Listening socket, shared between worker processes via SO_REUSEPORT where available"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(1024)
+    sock.setblocking(False)
+    return sock
+
+async def serve(db_path, host, port, pool_size, reuse_port):
+    service = QueryService(db_path, pool_size)
+    sock = make_socket(host, port, reuse_port)
+    server = await asyncio.start_server(
+        lambda r, w: handle_connection(service, r, w), sock=sock, limit=MAX_HEADER_BYTES)
+    print(f"Worker {os.getpid()} serving {db_path} on http://{host}:{port}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+def run_worker(db_path, host, port, pool_size, reuse_port):
+    try:
+        asyncio.run(serve(db_path, host, port, pool_size, reuse_port))
+    except KeyboardInterrupt:
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Read-only JSON API over mtg.db")
+    parser.add_argument("--db", default=DB_PATH, help="database path")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="server processes (needs SO_REUSEPORT for more than one)")
+    parser.add_argument("--pool-size", type=int, default=4, help="read connections per worker")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        sys.exit(f"Database not found: {args.db}. Run build_db.py first.")
+
+    reuse_port = hasattr(socket, "SO_REUSEPORT")
+    workers = args.workers
+    if workers > 1 and not reuse_port:
+        print("SO_REUSEPORT is not available on this platform; running a single worker.")
+        workers = 1
+
+    if workers == 1:
+        run_worker(args.db, args.host, args.port, args.pool_size, reuse_port)
+        return
+
+    processes = [multiprocessing.Process(target=run_worker,
+                                         args=(args.db, args.host, args.port, args.pool_size, reuse_port))
+                 for _ in range(workers)]
+    for p in processes:
+        p.start()
+    # Stop the workers too when this process is terminated
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        for p in processes:
+            p.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for p in processes:
+            p.terminate()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""Pages of the Streamlit app, one module per page, imported only when opened"""
+import importlib
+
+# (navigation label, module name) in display order
+PAGES = [
+    ("🔍 Quick Search", "quick_search"),
+    ("📝 Custom Query", "custom_query"),
+    ("🎯 Card Lookup", "card_lookup"),
+    ("🗄️ Database Explorer", "explorer"),
+    ("📊 Database Stats", "stats"),
+    ("🃏 Deck Comparison", "decks"),
+    ("⏱️ Performance", "performance"),
+]
+
+def load_page(module_name):
+    """Import a page module on first use"""
+    return importlib.import_module(f"{__name__}.{module_name}")
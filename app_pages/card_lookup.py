@@ -0,0 +1,67 @@
+"""Card Lookup page: card JSON, images, rulings and price history"""
+import streamlit as st
+
+from app_pages.common import (
+    execute_custom_query,
+    get_card_by_name,
+    get_image_cache,
+    open_scryfall,
+)
+from image_cache import card_image_urls
+from queries import PRICE_HISTORY_QUERY, RULINGS_QUERY, price_history_params
+
+def render(tables, card_count):
+    """Render the page"""
+    st.header("Card Lookup")
+    
+    card_name = st.text_input("Enter card name:", placeholder="Lightning Bolt")
+    
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        if st.button("Get Card Info"):
+            if card_name:
+                card_data = get_card_by_name(card_name)
+                if card_data:
+                    # Card images (both faces for double-faced cards) from the local cache
+                    image_cache = get_image_cache()
+                    futures = image_cache.prefetch(card_image_urls(card_data, "normal"))
+                    image_paths = [f.result() for f in futures if f.result()]
+                    if image_paths:
+                        st.image(image_paths, width=250)
+                    
+                    st.json(card_data)
+                    
+                    # Rulings (loaded with build_db.py --types ... rulings)
+                    if 'rulings' in tables and card_data.get('oracle_id'):
+                        rulings_df = execute_custom_query(
+                            RULINGS_QUERY,
+                            (card_data['oracle_id'],),
+                            query_type="card_lookup:rulings"
+                        )
+                        if not rulings_df.empty:
+                            st.subheader("Rulings")
+                            st.dataframe(rulings_df, use_container_width=True, hide_index=True)
+                    
+                    # Price history chart
+                    if 'price_history' in tables:
+                        st.subheader("Price History")
+                        history_df = execute_custom_query(
+                            PRICE_HISTORY_QUERY,
+                            price_history_params(card_data['id']),
+                            query_type="card_lookup:price_history"
+                        )
+                        if len(history_df) > 1:
+                            st.line_chart(history_df.set_index('date'))
+                        elif not history_df.empty:
+                            st.info("Only one price snapshot recorded so far.")
+                            st.dataframe(history_df, use_container_width=True, hide_index=True)
+                        else:
+                            st.info("No price history for this card.")
+                else:
+                    st.warning("Card not found.")
+            else:
+                st.warning("Please enter a card name.")
+    
+    with col2:
+        if st.button("Open in Scryfall") and card_name:
+            open_scryfall(card_name)
@@ -0,0 +1,190 @@
+"""Database and UI helpers shared by the app pages.
+
+Kept free of heavy imports (pandas, requests) at module level so the sidebar
+and navigation render before any page needs them.
+"""
+import json
+import os
+import subprocess
+import time
+import webbrowser
+
+import streamlit as st
+
+import query_log
+from queries import CARD_BY_NAME_QUERY
+
+# Database path
+DB_PATH = "mtg.db"
+TABLES_QUERY = "SELECT name FROM sqlite_master WHERE type='table';"
+
+# Local card image cache
+IMAGE_CACHE_DIR = "image_cache"
+IMAGE_CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+def cached_call(func, query_type, sql, *args):
+    """Call an st.cache_data function, logging a cache hit for `sql` if it ran no queries"""
+    before = query_log.execution_count()
+    start = time.perf_counter()
+    result = func(*args)
+    if query_log.execution_count() == before:
+        query_log.record_cache_hit(query_type, sql, (time.perf_counter() - start) * 1000)
+    return result
+
+def run_query(query, params=None, query_type="adhoc"):
+    """Run a query through the instrumented query layer and return a DataFrame"""
+    import pandas as pd
+
+    columns, rows = query_log.execute(DB_PATH, query, params, query_type)
+    return pd.DataFrame(rows, columns=columns)
+
+@st.cache_data
+def _cached_query(query, params, query_type):
+    return run_query(query, params, query_type)
+
+def cached_query(query, params=None, query_type="adhoc"):
+    """run_query with st.cache_data caching, for queries whose result only changes on rebuild"""
+    return cached_call(_cached_query, query_type, query, query, params, query_type)
+
+@st.cache_data
+def _get_database_info():
+    """Get basic database statistics"""
+    try:
+        # Get table info
+        _, rows = query_log.execute(DB_PATH, TABLES_QUERY,
+                                    query_type="sidebar:tables")
+        tables = [row[0] for row in rows]
+
+        # Get card count
+        card_count = 0
+        if 'cards_raw' in tables:
+            _, rows = query_log.execute(DB_PATH, "SELECT COUNT(*) FROM cards_raw",
+                                        query_type="sidebar:card_count")
+            card_count = rows[0][0]
+
+        return tables, card_count
+    except Exception as e:
+        st.error(f"Error connecting to database: {e}")
+        return [], 0
+
+def get_database_info():
+    """Cached database statistics, recording cache hits in the query log"""
+    return cached_call(_get_database_info, "sidebar:database_info", TABLES_QUERY)
+
+@st.cache_data
+def _get_table_schema():
+    """Get detailed schema information for all tables"""
+    try:
+        # Get all tables
+        _, rows = query_log.execute(DB_PATH, TABLES_QUERY,
+                                    query_type="schema:tables")
+        tables = [row[0] for row in rows]
+
+        schema_info = {}
+
+        for table in tables:
+            # Get column information
+            _, columns = query_log.execute(DB_PATH, f"PRAGMA table_info({table})",
+                                           query_type="schema:table_info")
+
+            # Get sample data (first 3 rows)
+            _, sample_data = query_log.execute(DB_PATH, f"SELECT * FROM {table} LIMIT 3",
+                                               query_type="schema:sample")
+
+            # Get row count
+            _, rows = query_log.execute(DB_PATH, f"SELECT COUNT(*) FROM {table}",
+                                        query_type="schema:row_count")
+            row_count = rows[0][0]
+
+            schema_info[table] = {
+                'columns': columns,
+                'sample_data': sample_data,
+                'row_count': row_count
+            }
+
+        return schema_info
+    except Exception as e:
+        st.error(f"Error getting schema: {e}")
+        return {}
+
+def get_table_schema():
+    """Cached schema information, recording cache hits in the query log"""
+    return cached_call(_get_table_schema, "schema:table_schema", TABLES_QUERY)
+
+def refresh_database():
+    """Refresh the database by running build_db.py"""
+    try:
+        # Run the build_db.py script
+        result = subprocess.run([
+            ".venv\\Scripts\\python.exe",
+            "build_db.py"
+        ], capture_output=True, text=True, cwd=os.getcwd())
+
+        if result.returncode == 0:
+            st.success("Database refreshed successfully!")
+            st.cache_data.clear()
+            return True
+        else:
+            st.error(f"Error refreshing database: {result.stderr}")
+            return False
+    except Exception as e:
+        st.error(f"Error running refresh: {e}")
+        return False
+
+def execute_custom_query(query, params=None, query_type="custom", cache=False):
+    """Execute a custom SQL query"""
+    try:
+        if cache:
+            return cached_query(query, params, query_type)
+        return run_query(query, params, query_type)
+    except Exception as e:
+        import pandas as pd
+
+        st.error(f"Query error: {e}")
+        return pd.DataFrame()
+
+def get_card_by_name(card_name):
+    """Get card data by name"""
+    try:
+        _, rows = query_log.execute(DB_PATH, CARD_BY_NAME_QUERY, (f"%{card_name}%",),
+                                    query_type="card_lookup")
+
+        if rows:
+            return json.loads(rows[0][0])
+        return None
+    except Exception as e:
+        st.error(f"Error fetching card: {e}")
+        return None
+
+@st.cache_resource
+def get_image_cache():
+    """Shared image cache for all sessions"""
+    from image_cache import ImageCache
+
+    return ImageCache(IMAGE_CACHE_DIR, max_bytes=IMAGE_CACHE_MAX_BYTES)
+
+def with_cached_images(df, column="image"):
+    """Swap a result page's image URLs for cached data URIs where cached.
+
+    Uncached images keep their Scryfall URL (the browser loads them) and are
+    prefetched in the background, so the next search showing them is served
+    from the cache. Nothing here waits on a download.
+    """
+    if column not in df.columns:
+        return df
+    cache = get_image_cache()
+    urls = list(df[column])
+    data_uris = [cache.data_uri(url) if url else None for url in urls]
+    cache.prefetch([url for url, data_uri in zip(urls, data_uris) if url and not data_uri])
+    df[column] = [data_uri or url for url, data_uri in zip(urls, data_uris)]
+    return df
+
+def open_scryfall(card_name=None):
+    """Open Scryfall in browser"""
+    if card_name:
+        url = f"https://scryfall.com/search?q={card_name.replace(' ', '+')}"
+    else:
+        url = "https://scryfall.com"
+
+    webbrowser.open(url)
+    st.success(f"Opening Scryfall: {url}")
@@ -0,0 +1,55 @@
+"""Custom Query page: run arbitrary SQL against the database"""
+import streamlit as st
+
+from app_pages.common import execute_custom_query
+
+def render(tables, card_count):
+    """Render the page"""
+    st.header("Custom SQL Query")
+    st.markdown("Write your own SQL queries to explore the database.")
+    
+    # Example queries
+    with st.expander("📚 Example Queries"):
+        st.code("""
+-- Find all blue instants that draw cards
+SELECT 
+    json_extract(json, '$.name') as name,
+    json_extract(json, '$.mana_cost') as mana_cost,
+    json_extract(json, '$.oracle_text') as oracle_text
+FROM cards_raw 
+WHERE json_extract(json, '$.type_line') LIKE '%Instant%'
+  AND json_extract(json, '$.oracle_text') LIKE '%draw%'
+  AND json_extract(json, '$.colors') LIKE '%U%'
+LIMIT 20;
+            """)
+        
+        st.code("""
+-- Find all planeswalkers
+SELECT 
+    json_extract(json, '$.name') as name,
+    json_extract(json, '$.mana_cost') as mana_cost,
+    json_extract(json, '$.type_line') as type_line
+FROM cards_raw 
+WHERE json_extract(json, '$.type_line') LIKE '%Planeswalker%'
+ORDER BY json_extract(json, '$.name')
+LIMIT 20;
+            """)
+    
+    query = st.text_area(
+        "Enter your SQL query:",
+        height=200,
+        placeholder="SELECT * FROM cards_raw LIMIT 10;"
+    )
+    
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        if st.button("Execute Query"):
+            if query.strip():
+                with st.spinner("Executing query..."):
+                    df = execute_custom_query(query)
+                    if not df.empty:
+                        st.dataframe(df, use_container_width=True)
+                    else:
+                        st.info("Query executed successfully but returned no results.")
+            else:
+                st.warning("Please enter a query.")
@@ -0,0 +1,81 @@
+"""Deck Comparison page: compare Moxfield decks from the deck_stats table"""
+import sqlite3
+from collections import Counter
+
+import streamlit as st
+
+import deck_stats
+from app_pages.common import DB_PATH, execute_custom_query
+
+def render(tables, card_count):
+    """Render the page"""
+    st.header("Deck Comparison")
+    st.markdown("Compare pulled Moxfield decks using the precomputed `deck_stats` table.")
+    
+    if 'moxfield_raw' in tables:
+        if st.button("🔄 Update Deck Stats"):
+            with st.spinner("Analyzing decks..."):
+                try:
+                    conn = sqlite3.connect(DB_PATH)
+                    updated = deck_stats.update_deck_stats(conn)
+                    conn.close()
+                    st.success(f"Updated stats for {updated} decks.")
+                    st.cache_data.clear()
+                    tables = tables + ['deck_stats']
+                except Exception as e:
+                    st.error(f"Error updating deck stats: {e}")
+    
+    if 'deck_stats' in tables:
+        decks_df = execute_custom_query(
+            "SELECT deck_id, deck_name, username, format FROM deck_stats ORDER BY deck_name",
+            query_type="decks:list"
+        )
+        # Deck names aren't unique, so label each deck with its owner and id as well
+        # (the full id when a short one would still leave two labels the same)
+        labels = {deck_id: f"{name} ({user}, {deck_id[:6]})" for deck_id, name, user
+                  in zip(decks_df['deck_id'], decks_df['deck_name'], decks_df['username'])}
+        repeated = {label for label, count in Counter(labels.values()).items() if count > 1}
+        for deck_id, name, user in zip(decks_df['deck_id'], decks_df['deck_name'], decks_df['username']):
+            if labels[deck_id] in repeated:
+                labels[deck_id] = f"{name} ({user}, {deck_id})"
+        selected_decks = st.multiselect(
+            "Select decks to compare:",
+            options=list(decks_df['deck_id']),
+            default=list(decks_df['deck_id'][:3]),
+            format_func=labels.get
+        )
+        
+        if selected_decks:
+            placeholders = ", ".join("?" for _ in selected_decks)
+            compare_df = execute_custom_query(
+                f"SELECT * FROM deck_stats WHERE deck_id IN ({placeholders})",
+                tuple(selected_decks),
+                query_type="decks:compare"
+            )
+            compare_df = compare_df.set_index('deck_id')
+            compare_df.index = compare_df.index.map(labels)
+            
+            st.subheader("Summary")
+            summary_columns = ['username', 'format', 'card_count', 'land_count', 'avg_cmc', 'colors',
+                               'total_price_usd', 'unpriced_cards', 'illegal_cards', 'is_legal']
+            st.dataframe(compare_df[summary_columns].T.astype(str), use_container_width=True)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.subheader("Mana Curve")
+                curve_columns = [f"curve_{b}" for b in deck_stats.CURVE_BUCKETS]
+                curve_df = compare_df[curve_columns].T
+                curve_df.index = [str(b) for b in deck_stats.CURVE_BUCKETS[:-1]] + [f"{deck_stats.CURVE_BUCKETS[-1]}+"]
+                st.bar_chart(curve_df, stack=False)
+            with col2:
+                st.subheader("Color Pips")
+                pip_columns = [f"pips_{c.lower()}" for c in deck_stats.COLORS]
+                pips_df = compare_df[pip_columns].T
+                pips_df.index = deck_stats.COLORS
+                st.bar_chart(pips_df, stack=False)
+        else:
+            st.info("Select at least one deck.")
+    elif 'moxfield_raw' in tables:
+        st.info("No deck stats yet. Click \"Update Deck Stats\" to analyze pulled decks.")
+    else:
+        st.warning("No Moxfield decks found. Run moxfield_pull.py first.")
@@ -0,0 +1,267 @@
+"""Database Explorer page: browse tables, columns and sample data"""
+import pandas as pd
+import streamlit as st
+
+import query_log
+from app_pages.common import DB_PATH, cached_query, get_table_schema, run_query
+
+def render(tables, card_count):
+    """Render the page"""
+    st.header("🗄️ Database Explorer")
+    st.markdown("Explore your database structure, tables, columns, and sample data.")
+    
+    # Get schema information
+    schema_info = get_table_schema()
+    
+    if schema_info:
+        # Create two columns for better layout
+        col_left, col_right = st.columns([1, 2])
+        
+        with col_left:
+            st.subheader("📊 Database Overview")
+            
+            # Table selector
+            selected_table = st.selectbox(
+                "Select a table to explore:",
+                options=list(schema_info.keys()),
+                format_func=lambda x: f"{x} ({schema_info[x]['row_count']:,} rows)"
+            )
+            
+            if selected_table:
+                table_info = schema_info[selected_table]
+                
+                # Display table information
+                st.metric("Table Name", selected_table)
+                st.metric("Total Rows", f"{table_info['row_count']:,}")
+                st.metric("Total Columns", len(table_info['columns']))
+                
+                st.divider()
+                
+                # Column selector
+                st.subheader("📋 Column Explorer")
+                
+                if table_info['columns']:
+                    # Create column dropdown
+                    column_names = [col[1] for col in table_info['columns']]
+                    selected_column = st.selectbox(
+                        "Select a column to explore:",
+                        options=column_names,
+                        help="Choose a column to see detailed information and sample data"
+                    )
+                    
+                    if selected_column:
+                        # Find the selected column info
+                        selected_col_info = None
+                        for col in table_info['columns']:
+                            if col[1] == selected_column:
+                                selected_col_info = col
+                                break
+                        
+                        if selected_col_info:
+                            col_id, col_name, data_type, not_null, default_val, primary_key = selected_col_info
+                            
+                            # Format data type
+                            if not data_type:
+                                data_type = "TEXT"
+                            
+                            st.markdown(f"**Column: `{col_name}`**")
+                            st.markdown(f"- **Type:** `{data_type}`")
+                            st.markdown(f"- **Primary Key:** {'Yes' if primary_key else 'No'}")
+                            st.markdown(f"- **Not Null:** {'Yes' if not_null else 'No'}")
+                            st.markdown(f"- **Default:** `{default_val if default_val else 'None'}`")
+                            
+                            # Get sample values for this column (cached, since these scan the whole table)
+                            try:
+                                # Get distinct values
+                                distinct_values = list(cached_query(f"SELECT DISTINCT {col_name} FROM {selected_table} WHERE {col_name} IS NOT NULL LIMIT 10",
+                                                                    query_type="explorer:column_sample").iloc[:, 0])
+                                
+                                # Get value count
+                                distinct_count = int(cached_query(f"SELECT COUNT(DISTINCT {col_name}) FROM {selected_table}",
+                                                                  query_type="explorer:distinct_count").iloc[0, 0])
+                                
+                                # Get null count
+                                null_count = int(cached_query(f"SELECT COUNT(*) FROM {selected_table} WHERE {col_name} IS NULL",
+                                                              query_type="explorer:null_count").iloc[0, 0])
+                                
+                                st.markdown(f"- **Distinct Values:** {distinct_count:,}")
+                                st.markdown(f"- **Null Values:** {null_count:,}")
+                                
+                                if distinct_values:
+                                    st.markdown("**Sample Values:**")
+                                    for value in distinct_values[:5]:
+                                        st.code(str(value)[:100] + ("..." if len(str(value)) > 100 else ""))
+                                    
+                                    if len(distinct_values) > 5:
+                                        st.markdown(f"... and {len(distinct_values) - 5} more")
+                                
+                            except Exception as e:
+                                st.error(f"Error getting column details: {e}")
+                        
+                        st.divider()
+                        
+                        # Column-specific queries
+                        st.subheader("🔍 Column Queries")
+                        
+                        # Count values
+                        if st.button(f"Count {selected_column} values", key=f"count_{selected_column}_{selected_table}"):
+                            try:
+                                _, results = query_log.execute(DB_PATH, f"SELECT {selected_column}, COUNT(*) as count FROM {selected_table} GROUP BY {selected_column} ORDER BY count DESC LIMIT 20",
+                                                               query_type="explorer:value_counts")
+                                
+                                if results:
+                                    df = pd.DataFrame(results, columns=[selected_column, 'Count'])
+                                    st.dataframe(df, use_container_width=True)
+                                else:
+                                    st.info("No data found")
+                            except Exception as e:
+                                st.error(f"Error: {e}")
+                        
+                        # Get distinct values
+                        if st.button(f"Get distinct {selected_column} values", key=f"distinct_{selected_column}_{selected_table}"):
+                            try:
+                                _, rows = query_log.execute(DB_PATH, f"SELECT DISTINCT {selected_column} FROM {selected_table} WHERE {selected_column} IS NOT NULL ORDER BY {selected_column} LIMIT 50",
+                                                            query_type="explorer:distinct_values")
+                                results = [row[0] for row in rows]
+                                
+                                if results:
+                                    st.write("**Distinct Values:**")
+                                    for value in results:
+                                        st.code(str(value))
+                                else:
+                                    st.info("No distinct values found")
+                            except Exception as e:
+                                st.error(f"Error: {e}")
+        
+        with col_right:
+            if selected_table:
+                table_info = schema_info[selected_table]
+                
+                st.subheader(f"📄 {selected_table} - Sample Data")
+                
+                # Sample data with column selection
+                if table_info['sample_data']:
+                    column_names = [col[1] for col in table_info['columns']]
+                    
+                    # Column selection for display
+                    selected_columns = st.multiselect(
+                        "Select columns to display:",
+                        options=column_names,
+                        default=column_names[:10] if len(column_names) > 10 else column_names,
+                        help="Choose which columns to show in the sample data"
+                    )
+                    
+                    if selected_columns:
+                        try:
+                            # Build query with selected columns
+                            columns_str = ", ".join(selected_columns)
+                            _, sample_data = query_log.execute(DB_PATH, f"SELECT {columns_str} FROM {selected_table} LIMIT 20",
+                                                               query_type="explorer:sample_columns")
+                            
+                            if sample_data:
+                                sample_df = pd.DataFrame(sample_data, columns=selected_columns)
+                                st.dataframe(sample_df, use_container_width=True)
+                                
+                                # Show raw data
+                                with st.expander("🔍 Raw Sample Data"):
+                                    for i, row in enumerate(sample_data):
+                                        st.markdown(f"**Row {i+1}:**")
+                                        st.code(str(row))
+                                        st.markdown("---")
+                            else:
+                                st.info("No sample data available for selected columns")
+                        except Exception as e:
+                            st.error(f"Error displaying sample data: {e}")
+                    else:
+                        st.info("Please select at least one column to display")
+                else:
+                    st.info("No sample data available")
+                
+                st.divider()
+                
+                # Advanced table queries
+                st.subheader("⚡ Table Query Generator")
+                
+                # Query type selector
+                query_type = st.selectbox(
+                    "Query Type:",
+                    ["Basic SELECT", "COUNT", "DISTINCT", "GROUP BY", "Custom"]
+                )
+                
+                if query_type == "Basic SELECT":
+                    limit = st.slider("Number of rows:", 1, 100, 10, key=f"basic_limit_{selected_table}")
+                    basic_query = f"SELECT * FROM {selected_table} LIMIT {limit};"
+                    st.code(basic_query, language='sql')
+                    
+                    if st.button("Execute Query", key=f"execute_basic_{selected_table}"):
+                        try:
+                            df = run_query(basic_query, query_type="explorer:basic_select")
+                            st.dataframe(df, use_container_width=True)
+                        except Exception as e:
+                            st.error(f"Error: {e}")
+                
+                elif query_type == "COUNT":
+                    count_query = f"SELECT COUNT(*) as total_rows FROM {selected_table};"
+                    st.code(count_query, language='sql')
+                    
+                    if st.button("Execute Count", key=f"execute_count_{selected_table}"):
+                        try:
+                            result = run_query(count_query, query_type="explorer:count")
+                            st.metric("Total Rows", result['total_rows'].iloc[0])
+                        except Exception as e:
+                            st.error(f"Error: {e}")
+                
+                elif query_type == "DISTINCT":
+                    if table_info['columns']:
+                        col_for_distinct = st.selectbox(
+                            "Column for DISTINCT:",
+                            options=[col[1] for col in table_info['columns']],
+                            key=f"distinct_col_{selected_table}"
+                        )
+                        limit = st.slider("Number of distinct values:", 1, 100, 20, key=f"distinct_limit_{selected_table}")
+                        distinct_query = f"SELECT DISTINCT {col_for_distinct} FROM {selected_table} LIMIT {limit};"
+                        st.code(distinct_query, language='sql')
+                        
+                        if st.button("Execute DISTINCT", key=f"execute_distinct_{selected_table}"):
+                            try:
+                                df = run_query(distinct_query, query_type="explorer:distinct")
+                                st.dataframe(df, use_container_width=True)
+                            except Exception as e:
+                                st.error(f"Error: {e}")
+                
+                elif query_type == "GROUP BY":
+                    if table_info['columns']:
+                        group_col = st.selectbox(
+                            "Group by column:",
+                            options=[col[1] for col in table_info['columns']],
+                            key=f"group_col_{selected_table}"
+                        )
+                        group_query = f"SELECT {group_col}, COUNT(*) as count FROM {selected_table} GROUP BY {group_col} ORDER BY count DESC LIMIT 20;"
+                        st.code(group_query, language='sql')
+                        
+                        if st.button("Execute GROUP BY", key=f"execute_group_{selected_table}"):
+                            try:
+                                df = run_query(group_query, query_type="explorer:group_by")
+                                st.dataframe(df, use_container_width=True)
+                            except Exception as e:
+                                st.error(f"Error: {e}")
+                
+                elif query_type == "Custom":
+                    custom_query = st.text_area(
+                        "Enter custom SQL query:",
+                        value=f"SELECT * FROM {selected_table} LIMIT 10;",
+                        height=100,
+                        key=f"custom_query_{selected_table}"
+                    )
+                    
+                    if st.button("Execute Custom Query", key=f"execute_custom_{selected_table}"):
+                        if custom_query.strip():
+                            try:
+                                df = run_query(custom_query, query_type="explorer:custom")
+                                st.dataframe(df, use_container_width=True)
+                            except Exception as e:
+                                st.error(f"Query error: {e}")
+                        else:
+                            st.warning("Please enter a query")
+    else:
+        st.warning("No database schema information available. Please refresh the database.")
@@ -0,0 +1,60 @@
+"""Performance page: query latency percentiles, slow queries and image cache stats"""
+import pandas as pd
+import streamlit as st
+
+import query_log
+from app_pages.common import DB_PATH, get_image_cache
+
+def render(tables, card_count):
+    """Render the page"""
+    st.header("Query Performance")
+    st.markdown(f"Latency of every database call made by this app since it started. "
+                f"Queries slower than {query_log.SLOW_QUERY_MS} ms are kept in the `slow_query_log` table.")
+    
+    # Latency percentiles per query type
+    st.subheader("Latency by Query Type")
+    summary = query_log.latency_summary()
+    if summary:
+        st.dataframe(pd.DataFrame(summary), use_container_width=True, hide_index=True)
+    else:
+        st.info("No queries recorded yet.")
+    
+    # Slowest recent queries with their plans
+    st.subheader("Slowest Recent Queries")
+    slow = query_log.slow_queries(DB_PATH, limit=20)
+    if slow:
+        for entry in slow:
+            with st.expander(f"{entry['elapsed_ms']:,.1f} ms · {entry['query_type']} · {entry['logged_at']}"):
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Rows", f"{entry['rows_returned']:,}")
+                with col2:
+                    st.metric("VM Steps", f"{entry['vm_steps']:,}")
+                with col3:
+                    st.metric("Full Scans", entry['full_scans'])
+                with col4:
+                    st.metric("Sorts", entry['sorts'])
+                st.code(entry['sql'], language='sql')
+                st.markdown("**Query Plan:**")
+                st.code(entry['plan'] or "(no plan)")
+                if entry['error']:
+                    st.error(entry['error'])
+    else:
+        st.info("No slow queries logged.")
+    
+    # Local image cache
+    st.subheader("Image Cache")
+    image_cache = get_image_cache()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Cache Size", f"{image_cache.total_bytes() / (1024 * 1024):,.1f} MB")
+    with col2:
+        st.metric("Hits", f"{image_cache.stats['hits']:,}")
+    with col3:
+        st.metric("Downloads", f"{image_cache.stats['misses']:,}")
+    with col4:
+        st.metric("Evictions", f"{image_cache.stats['evictions']:,}")
+    
+    if st.button("🗑️ Clear Performance Log"):
+        query_log.clear(DB_PATH)
+        st.rerun()
@@ -0,0 +1,28 @@
+"""Quick Search page: search cards by name, type, oracle text or set"""
+import streamlit as st
+
+from app_pages.common import execute_custom_query, with_cached_images
+from queries import SEARCH_TYPES, quick_search_query
+
+def render(tables, card_count):
+    """Render the page"""
+    st.header("Quick Card Search")
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        search_term = st.text_input("Search for cards:", placeholder="Enter card name, type, or text...")
+    
+    with col2:
+        search_type = st.selectbox("Search by:", SEARCH_TYPES)
+    
+    if st.button("Search") and search_term:
+        with st.spinner("Searching..."):
+            query, params = quick_search_query(search_term, search_type)
+            df = execute_custom_query(query, params, query_type=f"quick_search:{search_type}")
+            if not df.empty:
+                df = with_cached_images(df)
+                st.dataframe(df, use_container_width=True,
+                             column_config={"image": st.column_config.ImageColumn("Image")})
+            else:
+                st.info("No cards found matching your search.")
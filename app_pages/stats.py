@@ -0,0 +1,61 @@
+"""Database Stats page: card totals, rarity, recent sets and price movers"""
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from app_pages.common import execute_custom_query
+from queries import (
+    STATS_QUERY,
+    RARITY_QUERY,
+    RECENT_SETS_QUERY,
+    PRICE_CURRENCIES,
+    price_movers_query,
+)
+
+def render(tables, card_count):
+    """Render the page"""
+    st.header("Database Statistics")
+    
+    if card_count > 0:
+        # Get some basic stats
+        stats_df = execute_custom_query(STATS_QUERY, query_type="stats:totals", cache=True)
+        if not stats_df.empty:
+            stats = stats_df.iloc[0]
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Total Cards", f"{stats['total_cards']:,}")
+            with col2:
+                st.metric("Total Sets", f"{stats['total_sets']:,}")
+            with col3:
+                st.metric("Total Artists", f"{stats['total_artists']:,}")
+        
+        # Rarity distribution
+        st.subheader("Rarity Distribution")
+        rarity_df = execute_custom_query(RARITY_QUERY, query_type="stats:rarity", cache=True)
+        if not rarity_df.empty:
+            st.bar_chart(rarity_df.set_index('rarity'))
+        
+        # Recent sets
+        st.subheader("Recent Sets")
+        recent_sets_df = execute_custom_query(RECENT_SETS_QUERY, query_type="stats:recent_sets", cache=True)
+        if not recent_sets_df.empty:
+            st.dataframe(recent_sets_df, use_container_width=True)
+        
+        # Price movers
+        if 'price_history' in tables:
+            st.subheader("Biggest Price Movers")
+            col1, col2 = st.columns(2)
+            with col1:
+                since = st.date_input("Since:", value=datetime.now().date() - timedelta(days=30))
+            with col2:
+                currency = st.selectbox("Currency:", PRICE_CURRENCIES)
+            
+            movers_query, movers_params = price_movers_query(since.isoformat(), currency)
+            movers_df = execute_custom_query(movers_query, movers_params, query_type="stats:price_movers")
+            if not movers_df.empty:
+                st.dataframe(movers_df, use_container_width=True, hide_index=True)
+            else:
+                st.info("No price changes recorded since that date.")
+    else:
+        st.warning("No data available. Please refresh the database first.")
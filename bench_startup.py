@@ -0,0 +1,171 @@
+"""Startup and rerun benchmark for streamlit_app.py.
+
+Builds a synthetic database, then renders the app headlessly with Streamlit's
+AppTest in fresh processes to time cold start (imports plus first render) and,
+for every page, the first visit and a plain rerun. Results are JSON in the
+same layout as benchmark.py, so `python benchmark.py --compare` works on them.
+
+Usage:
+    python bench_startup.py --cards 10000 --runs 3 --output startup_results.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(REPO_DIR, "streamlit_app.py")
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "requests"]
+
+def child(app_path):
+    """Render the app once in this (fresh) process and print timings as JSON"""
+    start = time.perf_counter()
+    sys.path.insert(0, os.path.dirname(app_path))
+    from streamlit.testing.v1 import AppTest
+    imported = time.perf_counter()
+
+    at = AppTest.from_file(app_path, default_timeout=300)
+    at.run()
+    first_render = time.perf_counter()
+    loaded = {name: name in sys.modules for name in HEAVY_MODULES}
+
+    # Plain rerun of the landing page, as after any widget interaction
+    rerun_start = time.perf_counter()
+    at.run()
+    landing_rerun = time.perf_counter() - rerun_start
+
+    pages = {}
+    # Older app versions without page navigation render everything on the landing page
+    has_navigation = any(radio.key == "page" for radio in at.radio)
+    for label in (at.radio(key="page").options if has_navigation else []):
+        at.radio(key="page").set_value(label)
+        visit_start = time.perf_counter()
+        at.run()
+        visited = time.perf_counter()
+        at.run()
+        rerun = time.perf_counter() - visited
+        pages[label] = {"first_visit_s": round(visited - visit_start, 4), "rerun_s": round(rerun, 4),
+                        "errors": len(at.exception) + len(at.error)}
+
+    print(json.dumps({
+        "import_streamlit_s": round(imported - start, 4),
+        "first_render_s": round(first_render - imported, 4),
+        "landing_rerun_s": round(landing_rerun, 4),
+        "modules_loaded_at_first_render": loaded,
+        "pages": pages,
+    }))
+
+def build_database(workdir, cards, decks, seed):
+    """Synthetic mtg.db with cards, price history, decks and deck stats"""
+    import sqlite3
+
+    sys.path.insert(0, REPO_DIR)
+    import build_db
+    import deck_stats
+    import moxfield_pull
+    from benchmark import quiet
+    from synthetic_data import generate_cards, generate_decks
+
+    db_path = os.path.join(workdir, "mtg.db")
+    with quiet():
+        build_db.build_database(generate_cards(cards, seed), db_path)
+        moxfield_pull.DB_PATH = db_path
+        for deck in generate_decks(decks, list(generate_cards(min(cards, 5000), seed)), seed):
+            moxfield_pull.save_deck(*deck)
+    conn = sqlite3.connect(db_path)
+    deck_stats.update_deck_stats(conn)
+    conn.close()
+    return db_path
+
+def run(cards, decks, runs, seed, workdir=None, app_path=APP_PATH):
+    """Benchmark cold starts in `runs` fresh processes and return the results document"""
+    from benchmark import git_commit, summarize
+    import platform
+
+    workdir = workdir or tempfile.mkdtemp(prefix="mtg-startup-")
+    os.makedirs(workdir, exist_ok=True)
+    if not os.path.exists(os.path.join(workdir, "mtg.db")):
+        print(f"Building synthetic database with {cards:,} cards...")
+        build_database(workdir, cards, decks, seed)
+
+    # Interpreter startup alone, to separate it from the app's own cost
+    interpreter = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        interpreter.append(time.perf_counter() - start)
+
+    samples = []
+    for i in range(runs):
+        print(f"Cold start {i + 1}/{runs}...")
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", "--app", app_path], cwd=workdir,
+                             capture_output=True, text=True, check=True)
+        wall = time.perf_counter() - start
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        result["process_wall_s"] = wall
+        samples.append(result)
+
+    pages = {}
+    for label in samples[0]["pages"]:
+        pages[label] = {
+            "first_visit": summarize([s["pages"][label]["first_visit_s"] for s in samples]),
+            "rerun": summarize([s["pages"][label]["rerun_s"] for s in samples]),
+            "errors": max(s["pages"][label]["errors"] for s in samples),
+        }
+
+    startup = {
+        "interpreter_startup": summarize(interpreter),
+        "import_streamlit": summarize([s["import_streamlit_s"] for s in samples]),
+        "first_render": summarize([s["first_render_s"] for s in samples]),
+        "time_to_first_render": summarize([s["import_streamlit_s"] + s["first_render_s"] for s in samples]),
+        "process_wall": summarize([s["process_wall_s"] for s in samples]),
+        "landing_rerun": summarize([s["landing_rerun_s"] for s in samples]),
+        "modules_loaded_at_first_render": samples[0]["modules_loaded_at_first_render"],
+        "pages": pages,
+    }
+    return {
+        "meta": {
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": runs,
+            "seed": seed,
+            "app": app_path,
+            "workdir": workdir,
+        },
+        "results": [{"scale": cards, "startup": startup}],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlit app startup benchmark")
+    parser.add_argument("--cards", type=int, default=10000, help="synthetic cards in the database")
+    parser.add_argument("--decks", type=int, default=50, help="synthetic Moxfield decks")
+    parser.add_argument("--runs", type=int, default=3, help="cold starts to measure")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", help="directory holding (or to build) mtg.db")
+    parser.add_argument("--app", default=APP_PATH,
+                        help="streamlit_app.py to measure (e.g. from another checkout)")
+    parser.add_argument("--output", default="startup_results.json", help="JSON results file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(os.path.abspath(args.app))
+        return
+
+    report = run(args.cards, args.decks, args.runs, args.seed, args.workdir, os.path.abspath(args.app))
+    startup = report["results"][0]["startup"]
+    print(f"Time to first render: {startup['time_to_first_render']['median_ms']:.0f} ms (median)")
+    for label, page in startup["pages"].items():
+        print(f"  {label}: first visit {page['first_visit']['median_ms']:.0f} ms, "
+              f"rerun {page['rerun']['median_ms']:.0f} ms")
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
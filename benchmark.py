@@ -0,0 +1,291 @@
+"""Offline benchmark suite for the database build, app queries and Moxfield ingest.
+
+Generates synthetic Scryfall/Moxfield data, builds a throwaway database with
+build_db.py, times the Streamlit app's queries and writes the results as JSON.
+
+Usage:
+    python benchmark.py --scales 10000 100000 --output bench_results.json
+    python benchmark.py --scales 100000 --bulk-types default_cards all_cards rulings
+    python benchmark.py --compare old_results.json new_results.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import build_db
+import moxfield_pull
+from queries import (
+    SEARCH_TYPES,
+    quick_search_query,
+    CARD_BY_NAME_QUERY,
+    STATS_QUERY,
+    RARITY_QUERY,
+    RECENT_SETS_QUERY,
+)
+from synthetic_data import generate_cards, generate_decks, write_bulk_file
+
+# Search terms per Quick Search type: one that matches many cards, one that matches none
+SEARCH_TERMS = {
+    "Name": ["Bolt", "zzqx"],
+    "Type": ["Creature", "zzqx"],
+    "Oracle Text": ["draw a card", "zzqx"],
+    "Set": ["s01", "zzqx"],
+}
+DECK_CARD_POOL = 5000
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the build scripts' progress output while timing"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+def timed(func, *args, **kwargs):
+    """Run func once and return (result, seconds)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def summarize(samples):
+    """Summary statistics in milliseconds for a list of timings in seconds"""
+    ms = sorted(s * 1000 for s in samples)
+    p95_index = min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))
+    return {
+        "runs": len(ms),
+        "min_ms": round(ms[0], 3),
+        "median_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(ms[p95_index], 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+def time_query(conn, query, params=(), repeat=5):
+    """Time repeated executions of a query, returning the summary and row count"""
+    samples = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = len(conn.execute(query, params).fetchall())
+        samples.append(time.perf_counter() - start)
+    result = summarize(samples)
+    result["rows"] = rows
+    return result
+
+def bench_build(workdir, scale, seed, bulk_types=("default_cards",)):
+    """Time each build_db.py phase for `scale` synthetic rows per bulk type"""
+    db_path = os.path.join(workdir, "mtg.db")
+    bulk_files = {t: os.path.join(workdir, f"{t}.json") for t in bulk_types}
+    phases = {}
+
+    start = time.perf_counter()
+    for bulk_type, path in bulk_files.items():
+        write_bulk_file(path, scale, seed, bulk_type)
+    phases["generate_bulk_file_s"] = time.perf_counter() - start
+
+    conn = sqlite3.connect(db_path)
+    rows = 0
+    with quiet():
+        _, phases["create_raw_table_s"] = timed(build_db.create_raw_table, conn)
+        if "all_cards" in bulk_files:
+            _, phases["create_intl_table_s"] = timed(build_db.create_intl_table, conn)
+        if "rulings" in bulk_files:
+            _, phases["create_rulings_table_s"] = timed(build_db.create_rulings_table, conn)
+        # Streams each file from disk as build_db.py does after downloading it
+        for bulk_type in [t for t in build_db.BULK_TYPES if t in bulk_files]:
+            counts, phases[f"load_{bulk_type}_s"] = timed(build_db.load_bulk_file, conn, bulk_type,
+                                                          bulk_files[bulk_type])
+            rows += sum(counts.values())
+        if "all_cards" in bulk_files:
+            _, phases["promote_only_language_printings_s"] = timed(build_db.promote_only_language_printings, conn)
+            conn.commit()
+        _, phases["create_bulk_indexes_s"] = timed(build_db.create_bulk_indexes, conn)
+        _, phases["create_structured_table_s"] = timed(build_db.create_structured_table, conn)
+    conn.close()
+
+    phases = {k: round(v, 4) for k, v in phases.items()}
+    phases["total_build_s"] = round(sum(v for k, v in phases.items() if k != "generate_bulk_file_s"), 4)
+    phases["rows_per_s"] = round(rows / phases["total_build_s"], 1) if phases["total_build_s"] else None
+    phases["bulk_file_bytes"] = sum(os.path.getsize(path) for path in bulk_files.values())
+    phases["db_bytes"] = os.path.getsize(db_path)
+    for path in bulk_files.values():
+        os.remove(path)
+    return db_path, phases
+
+def bench_queries(db_path, repeat):
+    """Time Quick Search, Card Lookup and Database Stats queries"""
+    conn = sqlite3.connect(db_path)
+    results = {"quick_search": {}, "card_lookup": {}, "stats": {}}
+
+    for search_type in SEARCH_TYPES:
+        for term in SEARCH_TERMS[search_type]:
+            query, params = quick_search_query(term, search_type)
+            results["quick_search"][f"{search_type}:{term}"] = time_query(conn, query, params, repeat)
+
+    # Look up a card near the start, middle and end of the table plus a miss
+    total = conn.execute("SELECT COUNT(*) FROM cards_raw").fetchone()[0]
+    names = {}
+    for label, offset in [("first", 0), ("middle", total // 2), ("last", max(total - 1, 0))]:
+        row = conn.execute("SELECT json_extract(json, '$.name') FROM cards_raw LIMIT 1 OFFSET ?",
+                           (offset,)).fetchone()
+        if row:
+            names[label] = row[0]
+    names["missing"] = "No Such Card zzqx"
+    for label, name in names.items():
+        results["card_lookup"][label] = time_query(conn, CARD_BY_NAME_QUERY, (f"%{name}%",), repeat)
+
+    for label, query in [("totals", STATS_QUERY), ("rarity", RARITY_QUERY), ("recent_sets", RECENT_SETS_QUERY)]:
+        results["stats"][label] = time_query(conn, query, (), repeat)
+
+    conn.close()
+    return results
+
+def bench_moxfield(db_path, deck_count, seed):
+    """Time moxfield_pull.save_deck for synthetic decks"""
+    card_pool = list(generate_cards(DECK_CARD_POOL, seed))
+    decks = list(generate_decks(deck_count, card_pool, seed))
+
+    original_path = moxfield_pull.DB_PATH
+    moxfield_pull.DB_PATH = db_path
+    samples = []
+    try:
+        with quiet():
+            for deck_id, username, deck_data in decks:
+                start = time.perf_counter()
+                moxfield_pull.save_deck(deck_id, username, deck_data)
+                samples.append(time.perf_counter() - start)
+    finally:
+        moxfield_pull.DB_PATH = original_path
+
+    result = summarize(samples) if samples else {"runs": 0}
+    result["total_s"] = round(sum(samples), 4)
+    result["decks_per_s"] = round(len(samples) / sum(samples), 1) if samples else None
+    return result
+
+def git_commit():
+    """Current git commit of the repo, if available"""
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+def run(scales, deck_count, repeat, seed, keep_dir=None, bulk_types=("default_cards",)):
+    """Run the full suite for each scale and return the results document"""
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "decks": deck_count,
+            "bulk_types": list(bulk_types),
+        },
+        "results": [],
+    }
+
+    for scale in scales:
+        print(f"Benchmarking {scale:,} cards...")
+        workdir = keep_dir or tempfile.mkdtemp(prefix="mtg-bench-")
+        db_path, build = bench_build(workdir, scale, seed, bulk_types)
+        print(f"  build: {build['total_build_s']}s ({build['rows_per_s']} rows/s)")
+        queries = bench_queries(db_path, repeat)
+        print("  queries done")
+        moxfield = bench_moxfield(db_path, deck_count, seed)
+        print(f"  moxfield ingest: {moxfield['total_s']}s for {deck_count} decks")
+
+        report["results"].append({
+            "scale": scale,
+            "build": build,
+            "queries": queries,
+            "moxfield_ingest": moxfield,
+            "peak_rss_mb": peak_rss_mb(),
+        })
+
+        if not keep_dir:
+            os.remove(db_path)
+            os.rmdir(workdir)
+
+    return report
+
+def flatten(report):
+    """Map of "scale/section/.../metric" -> number for comparing two reports"""
+    flat = {}
+
+    def walk(prefix, value):
+        if isinstance(value, dict):
+            for key, child in value.items():
+                walk(f"{prefix}/{key}", child)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[prefix] = value
+
+    for result in report["results"]:
+        walk(str(result["scale"]), {k: v for k, v in result.items() if k != "scale"})
+    return flat
+
+def compare(old_path, new_path, threshold=0.10):
+    """Print timing metrics that moved by more than `threshold` between two reports"""
+    with open(old_path) as f:
+        old = flatten(json.load(f))
+    with open(new_path) as f:
+        new = flatten(json.load(f))
+
+    regressions = 0
+    for key in sorted(old.keys() & new.keys()):
+        # Only compare durations; throughput metrics like rows_per_s move the other way
+        is_duration = (key.endswith("_ms") or key.endswith("_s")) and not key.endswith("_per_s")
+        if not is_duration or not old[key]:
+            continue
+        change = (new[key] - old[key]) / old[key]
+        if abs(change) >= threshold:
+            label = "SLOWER" if change > 0 else "faster"
+            regressions += change > 0
+            print(f"{label:7} {change:+7.1%}  {key}: {old[key]} -> {new[key]}")
+    print(f"{regressions} metric(s) regressed by more than {threshold:.0%}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline MTG database benchmark suite")
+    parser.add_argument("--scales", type=int, nargs="+", default=[10000],
+                        help="card counts to benchmark (e.g. 10000 100000 1000000)")
+    parser.add_argument("--decks", type=int, default=200, help="synthetic Moxfield decks to ingest")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per query")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--bulk-types", nargs="+", choices=["default_cards", "all_cards", "rulings"],
+                        default=["default_cards"], help="synthetic bulk files to build from")
+    parser.add_argument("--output", default="bench_results.json", help="JSON results file")
+    parser.add_argument("--keep-dir", help="build into this directory and keep the database")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="compare two results files instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare) else 0)
+
+    report = run(args.scales, args.decks, args.repeat, args.seed, args.keep_dir, args.bulk_types)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
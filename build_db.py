@@ -1,9 +1,27 @@
+import argparse
+import codecs
 import requests
 import sqlite3
 import json
 import os
+import time
+import uuid
+from datetime import datetime
+import price_history
 
 DB_PATH = "mtg.db"
+SQL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "create_cards_table.sql")
+BULK_META_URL = "https://api.scryfall.com/bulk-data"
+# Downloaded bulk files are kept here between builds
+BULK_DIR = "bulk_data"
+# Scryfall bulk types the builder can load, in load order
+CARD_BULK_TYPES = ["default_cards", "oracle_cards", "unique_artwork", "all_cards"]
+BULK_TYPES = CARD_BULK_TYPES + ["rulings"]
+# Rows per executemany batch, and bytes per read when streaming bulk files
+INSERT_BATCH = 5000
+READ_CHUNK = 1024 * 1024
+# Bulk file objects per committed ingest chunk; an interrupted build resumes after the last one
+CHECKPOINT_ROWS = 20000
 
 def read_sql_file(filename):
     """Read SQL file and return its contents"""
@@ -14,78 +32,657 @@ def read_sql_file(filename):
         print(f"Warning: {filename} not found. Skipping structured table creation.")
         return None
 
-# Step 1: Get the latest bulk card data metadata
-print("Fetching bulk data metadata...")
-bulk_url = "https://api.scryfall.com/bulk-data"
-bulk_meta = requests.get(bulk_url).json()
-
-# Find the "default_cards" bulk file (contains all non-digital, real MTG cards)
-default_cards_uri = next(
-    d["download_uri"] for d in bulk_meta["data"] if d["type"] == "default_cards"
-)
-
-print("Downloading card data...")
-cards_json = requests.get(default_cards_uri).json()
-print(f"Downloaded {len(cards_json)} cards.")
-
-# Step 2: Create SQLite database
-print("Creating database...")
-conn = sqlite3.connect(DB_PATH)
-cur = conn.cursor()
-
-# Drop existing tables
-cur.execute("DROP TABLE IF EXISTS cards")
-cur.execute("DROP TABLE IF EXISTS cards_raw")
-
-# Create raw JSON table
-print("Creating cards_raw table...")
-cur.execute("""
-CREATE TABLE cards_raw (
-    id TEXT PRIMARY KEY,
-    json TEXT
-)
-""")
-
-# Step 3: Insert raw JSON data
-print("Inserting card data...")
-for i, card in enumerate(cards_json):
-    if i % 1000 == 0:
-        print(f"Processed {i}/{len(cards_json)} cards...")
-    
+def fetch_bulk_metadata():
+    """Scryfall bulk data entries keyed by type (default_cards, all_cards, rulings, ...)"""
+    print("Fetching bulk data metadata...")
+    response = requests.get(BULK_META_URL)
+    response.raise_for_status()
+    return {d["type"]: d for d in response.json()["data"]}
+
+def download_bulk_file(entry, dest_dir=BULK_DIR):
+    """Stream one bulk file to disk and return its path.
+
+    all_cards is several GB, so it is never held in memory: it is written in
+    chunks to a .part file that is renamed once complete. If a .part file is
+    left from an interrupted download of the same file version (recorded in
+    a .part.meta file next to it), the rest is requested with a Range header
+    and appended; a .part from any other version is discarded.
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    path = os.path.join(dest_dir, f"{entry['type']}.json")
+    tmp_path = path + ".part"
+    meta_path = tmp_path + ".meta"
+    version = {"updated_at": entry.get("updated_at"), "download_uri": entry["download_uri"]}
+
+    if os.path.exists(tmp_path):
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            saved = None
+        if saved != version:
+            print(f"  discarding partial download of a different {entry['type']} version")
+            os.remove(tmp_path)
+    written = os.path.getsize(tmp_path) if os.path.exists(tmp_path) else 0
+    if not written:
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(version, f)
+    headers = {}
+    if written:
+        # Ranges count bytes of the uncompressed file, which is what the .part file holds
+        headers = {"Range": f"bytes={written}-", "Accept-Encoding": "identity"}
+
+    print(f"Downloading {entry['type']} ({entry.get('size', 0) / 1e6:,.0f} MB)...")
+    with requests.get(entry["download_uri"], stream=True, headers=headers) as response:
+        response.raise_for_status()
+        if written and response.status_code == 206:
+            print(f"  resuming at {written / 1e6:,.0f} MB")
+            mode = "ab"
+        else:
+            mode, written = "wb", 0
+        with open(tmp_path, mode) as f:
+            for chunk in response.iter_content(chunk_size=READ_CHUNK):
+                f.write(chunk)
+                written += len(chunk)
+                if written % (100 * READ_CHUNK) < len(chunk):
+                    print(f"  {written / 1e6:,.0f} MB...")
+    os.replace(tmp_path, path)
+    os.remove(meta_path)
+    return path
+
+class JsonArrayReader:
+    """Iterate (object, json_text) over the objects in a JSON array file.
+
+    Reads the file in chunks instead of json.load()ing it, so memory stays
+    flat however large the file is. json_text is the object's original text,
+    which is stored as-is rather than re-serialized. `offset` is the byte
+    offset just past the last object yielded; a new reader started at that
+    offset continues with the next object.
+    """
+
+    def __init__(self, path, offset=0):
+        self.path = path
+        self.offset = offset
+        self.count = 0
+
+    def __iter__(self):
+        decoder = json.JSONDecoder()
+        utf8 = codecs.getincrementaldecoder("utf-8")()
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            buf = utf8.decode(f.read(READ_CHUNK))
+            pos = 0
+            if self.offset == 0:
+                pos = len(buf) - len(buf.lstrip())
+                if not buf.startswith("[", pos):
+                    raise ValueError(f"{self.path} is not a JSON array")
+                pos += 1
+            # buf[mark] is the character at byte `offset`
+            mark = 0
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n,":
+                    pos += 1
+                if pos < len(buf) and buf[pos] == "]":
+                    return
+                try:
+                    obj, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    # Object continues past the end of the buffer: read more and retry
+                    more = f.read(READ_CHUNK)
+                    if not more:
+                        raise
+                    self.offset += len(buf[mark:pos].encode("utf-8"))
+                    buf, pos, mark = buf[pos:] + utf8.decode(more), 0, 0
+                    continue
+                self.offset += len(buf[mark:end].encode("utf-8"))
+                self.count += 1
+                mark = end
+                yield obj, buf[pos:end]
+                pos = end
+
+def create_raw_table(conn):
+    """Drop the old card tables and create an empty cards_raw table"""
+    cur = conn.cursor()
+
+    # Drop existing tables
+    cur.execute("DROP TABLE IF EXISTS cards")
+    cur.execute("DROP TABLE IF EXISTS cards_raw")
+
+    # Create raw JSON table
+    print("Creating cards_raw table...")
+    cur.execute("""
+    CREATE TABLE cards_raw (
+        id TEXT PRIMARY KEY,
+        json TEXT
+    )
+    """)
+
+def create_intl_table(conn):
+    """Create an empty cards_raw_intl table for non-English printings from all_cards"""
+    cur = conn.cursor()
+    cur.execute("DROP TABLE IF EXISTS cards_raw_intl")
+
+    print("Creating cards_raw_intl table...")
+    cur.execute("""
+    CREATE TABLE cards_raw_intl (
+        id TEXT PRIMARY KEY,
+        lang TEXT NOT NULL,
+        oracle_id TEXT,
+        json TEXT
+    )
+    """)
+
+def create_rulings_table(conn):
+    """Create an empty rulings table"""
+    cur = conn.cursor()
+    cur.execute("DROP TABLE IF EXISTS rulings")
+
+    print("Creating rulings table...")
+    cur.execute("""
+    CREATE TABLE rulings (
+        oracle_id TEXT NOT NULL,
+        source TEXT,
+        published_at TEXT,
+        comment TEXT
+    )
+    """)
+
+def insert_raw_cards(conn, cards_json, total=None):
+    """Insert card dicts into cards_raw as JSON strings"""
+    if total is None and hasattr(cards_json, '__len__'):
+        total = len(cards_json)
+    records = ((card, json.dumps(card)) for card in cards_json)
+    return insert_card_records(conn, records, total)["cards_raw"]
+
+def insert_card_records(conn, records, total=None, split_languages=False, checkpoint=None,
+                        batch_size=INSERT_BATCH):
+    """Insert (card, json_text) pairs in batches and return rows added per table.
+
+    With split_languages, non-English printings go to cards_raw_intl (unless
+    the same printing is already in cards_raw); promote_only_language_printings
+    then moves printings with no English version back, so cards_raw keeps one
+    English-or-only-language row per printing as in default_cards.
+
+    If checkpoint is given, checkpoint(counts, final) is called after every
+    batch of batch_size records and is responsible for committing; otherwise
+    everything is committed at the end.
+    """
+    cur = conn.cursor()
+    counts = {"cards_raw": 0, "cards_raw_intl": 0}
+    raw_rows, intl_rows = [], []
+
+    def flush(final=False):
+        if raw_rows:
+            cur.executemany("INSERT OR IGNORE INTO cards_raw (id, json) VALUES (?, ?)", raw_rows)
+            counts["cards_raw"] += cur.rowcount
+            raw_rows.clear()
+        if intl_rows:
+            cur.executemany("""
+            INSERT OR IGNORE INTO cards_raw_intl (id, lang, oracle_id, json)
+            SELECT ?, ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM cards_raw WHERE id = ?)
+            """, intl_rows)
+            counts["cards_raw_intl"] += cur.rowcount
+            intl_rows.clear()
+        if checkpoint:
+            checkpoint(counts, final)
+
+    print("Inserting card data...")
+    for i, (card, text) in enumerate(records):
+        lang = card.get("lang", "en")
+        if split_languages and lang != "en":
+            # Reversible cards keep their oracle_id on the faces
+            oracle_id = card.get("oracle_id") or (card.get("card_faces") or [{}])[0].get("oracle_id")
+            intl_rows.append((card["id"], lang, oracle_id, text, card["id"]))
+        else:
+            raw_rows.append((card["id"], text))
+
+        if len(raw_rows) + len(intl_rows) >= batch_size:
+            flush()
+            print(f"Processed {i + 1}/{total if total is not None else '?'} cards...")
+    flush(final=True)
+
+    if not checkpoint:
+        print("Committing raw data...")
+        conn.commit()
+    return counts
+
+def insert_rulings(conn, records, checkpoint=None, batch_size=INSERT_BATCH):
+    """Insert (ruling, json_text) pairs into rulings in batches and return rows added.
+
+    checkpoint and batch_size work as in insert_card_records.
+    """
+    cur = conn.cursor()
+    counts = {"rulings": 0}
+    rows = []
+
+    def flush(final=False):
+        cur.executemany("INSERT INTO rulings VALUES (?, ?, ?, ?)", rows)
+        counts["rulings"] += len(rows)
+        rows.clear()
+        if checkpoint:
+            checkpoint(counts, final)
+
+    print("Inserting rulings...")
+    for ruling, _ in records:
+        rows.append((ruling["oracle_id"], ruling.get("source"), ruling.get("published_at"),
+                     ruling.get("comment")))
+        if len(rows) >= batch_size:
+            flush()
+    flush(final=True)
+
+    if not checkpoint:
+        print("Committing rulings...")
+        conn.commit()
+    return counts
+
+def promote_only_language_printings(conn):
+    """Move printings with no English version from cards_raw_intl into cards_raw.
+
+    all_cards has no separate row marking a printing's only language (a
+    Japanese-only promo, say) the way default_cards does, so after loading
+    it every printing whose set and collector number has no row in cards_raw
+    gets one there: the first of its languages. Returns rows moved; the
+    caller commits.
+    """
+    cur = conn.cursor()
+    print("Moving printings with no English version into cards_raw...")
+    cur.execute("DROP TABLE IF EXISTS temp.raw_printings")
+    cur.execute("""
+    CREATE TEMP TABLE raw_printings AS
+    SELECT json_extract(json, '$.set') AS set_code, json_extract(json, '$.collector_number') AS number
+    FROM cards_raw
+    """)
+    cur.execute("CREATE INDEX temp.idx_raw_printings ON raw_printings(set_code, number)")
     cur.execute("""
     INSERT OR IGNORE INTO cards_raw (id, json)
-    VALUES (?, ?)
-    """, (
-        card["id"],
-        json.dumps(card)   # convert the whole card dict to a JSON string
-    ))
-
-print("Committing raw data...")
-conn.commit()
-
-# Step 4: Create structured cards table using SQL file
-print("Creating structured cards table...")
-sql_content = read_sql_file("create_cards_table.sql")
-
-if sql_content:
-    # Split the SQL file into individual statements
-    statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
-    
-    for statement in statements:
-        if statement:
-            try:
-                cur.execute(statement)
-                print(f"Executed: {statement[:50]}...")
-            except Exception as e:
-                print(f"Error executing statement: {e}")
-                print(f"Statement: {statement[:100]}...")
-    
-    print("Committing structured data...")
+    SELECT id, json FROM (
+        SELECT id, json, ROW_NUMBER() OVER (PARTITION BY set_code, number ORDER BY lang, id) AS n
+        FROM (SELECT id, lang, json, json_extract(json, '$.set') AS set_code,
+                     json_extract(json, '$.collector_number') AS number
+              FROM cards_raw_intl) i
+        WHERE NOT EXISTS (SELECT 1 FROM raw_printings r WHERE r.set_code = i.set_code AND r.number = i.number)
+    ) WHERE n = 1
+    """)
+    moved = cur.rowcount
+    cur.execute("DELETE FROM cards_raw_intl WHERE id IN (SELECT id FROM cards_raw)")
+    cur.execute("DROP TABLE temp.raw_printings")
+    return moved
+
+def create_bulk_indexes(conn):
+    """Index the intl and rulings tables, after loading so inserts stay fast"""
+    cur = conn.cursor()
+    tables = {row[0] for row in cur.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    if "cards_raw_intl" in tables:
+        print("Indexing cards_raw_intl...")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_cards_raw_intl_oracle_id ON cards_raw_intl(oracle_id)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_cards_raw_intl_lang ON cards_raw_intl(lang)")
+    if "rulings" in tables:
+        print("Indexing rulings...")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_rulings_oracle_id ON rulings(oracle_id, published_at)")
+    conn.commit()
+
+def create_structured_table(conn, sql_file=SQL_FILE, indexes=True):
+    """Create the structured cards table using the SQL file (without its indexes if indexes=False)"""
+    cur = conn.cursor()
+
+    print("Creating structured cards table...")
+    sql_content = read_sql_file(sql_file)
+
+    if sql_content:
+        # Split the SQL file into individual statements
+        statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
+        if not indexes:
+            statements = [stmt for stmt in statements if not is_index_statement(stmt)]
+
+        for statement in statements:
+            if statement:
+                try:
+                    cur.execute(statement)
+                    print(f"Executed: {statement[:50]}...")
+                except Exception as e:
+                    print(f"Error executing statement: {e}")
+                    print(f"Statement: {statement[:100]}...")
+
+        print("Committing structured data...")
+        conn.commit()
+    else:
+        print("Skipping structured table creation (SQL file not found)")
+
+def is_index_statement(statement):
+    return statement.upper().startswith(("CREATE INDEX", "CREATE UNIQUE INDEX"))
+
+def create_structured_indexes(conn, sql_file=SQL_FILE):
+    """Run only the CREATE INDEX statements from the SQL file"""
+    cur = conn.cursor()
+    sql_content = read_sql_file(sql_file) or ""
+    for statement in [stmt.strip() for stmt in sql_content.split(';') if is_index_statement(stmt.strip())]:
+        print(f"Executed: {statement[:50]}...")
+        cur.execute(statement)
+    conn.commit()
+
+def record_price_snapshot(conn, snapshot_date=None):
+    """Append a price snapshot, skipping it if the cards table was not created"""
+    cur = conn.cursor()
+    cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='cards'")
+    if cur.fetchone() is None:
+        print("Skipping price snapshot (cards table not found)")
+        return 0
+
+    print("Recording price snapshot...")
+    changed = price_history.record_snapshot(conn, snapshot_date)
+    print(f"Recorded {changed} price changes.")
+    return changed
+
+def write_build_info(conn):
+    """Record a unique id for this build and switch the database to WAL mode.
+
+    Readers such as api_server.py use the build id to version their caches.
+    WAL keeps those readers and a later build from locking each other out, but
+    a rebuild still replaces tables in place, so readers can see missing or
+    partly loaded tables until it finishes.
+    """
+    cur = conn.cursor()
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS build_info (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+    """)
+    build_id = uuid.uuid4().hex[:16]
+    cur.executemany("INSERT OR REPLACE INTO build_info (key, value) VALUES (?, ?)", [
+        ("build_id", build_id),
+        ("built_at", datetime.now().isoformat(timespec="seconds")),
+    ])
+    conn.commit()
+    cur.execute("PRAGMA journal_mode=WAL")
+    return build_id
+
+def build_database(cards_json, db_path=DB_PATH):
+    """Build cards_raw and cards in db_path from a list or iterable of card dicts"""
+    # Step 2: Create SQLite database
+    print("Creating database...")
+    conn = sqlite3.connect(db_path)
+
+    create_raw_table(conn)
+
+    # Step 3: Insert raw JSON data
+    insert_raw_cards(conn, cards_json)
+
+    # Step 4: Create structured cards table using SQL file
+    create_structured_table(conn)
+
+    # Step 5: Append today's price changes to the price history
+    record_price_snapshot(conn)
+
+    # Step 6: Stamp the build so readers can invalidate their caches
+    write_build_info(conn)
+
+    conn.close()
+
+def insert_bulk_records(conn, bulk_type, records, checkpoint=None, batch_size=INSERT_BATCH):
+    """Insert records from a bulk file of the given type and return rows added per table"""
+    if bulk_type == "rulings":
+        return insert_rulings(conn, records, checkpoint, batch_size)
+    return insert_card_records(conn, records, split_languages=bulk_type == "all_cards",
+                               checkpoint=checkpoint, batch_size=batch_size)
+
+def load_bulk_file(conn, bulk_type, path):
+    """Stream one bulk file into its tables in one transaction and return rows added per table"""
+    return insert_bulk_records(conn, bulk_type, JsonArrayReader(path))
+
+class BuildState:
+    """Progress of a build, kept in the build_state table of the database being built.
+
+    Each step has a status ("running" or "done") and a JSON detail with its
+    row counts, seconds spent and, for ingest steps, how far into the bulk
+    file it got. The "plan" row identifies the build (bulk types and the
+    version of each file), so a restarted build only resumes a matching one.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS build_state (
+            step TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            detail TEXT,
+            updated_at TEXT
+        )
+        """)
+        conn.commit()
+
+    def get(self, step):
+        """(status, detail) for a step, or (None, {}) if it has not started"""
+        row = self.conn.execute("SELECT status, detail FROM build_state WHERE step = ?", (step,)).fetchone()
+        return (row[0], json.loads(row[1] or "{}")) if row else (None, {})
+
+    def save(self, step, status, detail):
+        """Record a step's progress; committed by the caller with the work it describes"""
+        self.conn.execute("""
+        INSERT OR REPLACE INTO build_state (step, status, detail, updated_at) VALUES (?, ?, ?, ?)
+        """, (step, status, json.dumps(detail), datetime.now().isoformat(timespec="seconds")))
+
+    def is_done(self, step):
+        return self.get(step)[0] == "done"
+
+    def begin(self, plan, restart=False):
+        """Resume an unfinished build of the same plan, or start over. Returns True when resuming."""
+        status, saved_plan = self.get("plan")
+        if not restart and status == "running" and saved_plan == plan:
+            return True
+        # Downloaded files stay valid across builds; their steps check the file version themselves
+        self.conn.execute("DELETE FROM build_state WHERE step NOT LIKE 'download:%'")
+        self.save("plan", "running", plan)
+        self.conn.commit()
+        return False
+
+    def finish(self, plan):
+        self.save("plan", "done", plan)
+        self.conn.commit()
+
+def run_step(state, name, func, *args):
+    """Run func(*args) as a build step unless an earlier run already finished it.
+
+    Steps are safe to re-run, so a crash after the work but before it is
+    marked done only repeats that one step.
+    """
+    if state.is_done(name):
+        print(f"Skipping {name} (already done)")
+        return
+    start = time.perf_counter()
+    func(*args)
+    state.save(name, "done", {"rows": {}, "seconds": time.perf_counter() - start})
+    state.conn.commit()
+
+def download_step(state, entry, dest_dir):
+    """Download a bulk file unless the same version was already downloaded; returns its path"""
+    name = f"download:{entry['type']}"
+    status, detail = state.get(name)
+    path = detail.get("path")
+    if (status == "done" and detail.get("version") == entry["updated_at"]
+            and path and os.path.exists(path) and os.path.getsize(path) == detail.get("bytes")):
+        print(f"Skipping {name} ({entry['updated_at']} already downloaded)")
+        return path
+
+    start = time.perf_counter()
+    path = download_bulk_file(entry, dest_dir)
+    state.save(name, "done", {"rows": {}, "seconds": time.perf_counter() - start, "path": path,
+                              "bytes": os.path.getsize(path), "version": entry["updated_at"]})
+    state.conn.commit()
+    return path
+
+def ingest_step(state, bulk_type, path, chunk_rows=CHECKPOINT_ROWS):
+    """Stream a bulk file into its tables, committing every chunk_rows objects.
+
+    Each commit also records the byte offset reached in the file, so after
+    a crash the next run continues from the last committed chunk.
+    """
+    name = f"ingest:{bulk_type}"
+    status, detail = state.get(name)
+    if status == "done":
+        print(f"Skipping {name} (already done)")
+        return
+    detail = detail or {"rows": {}, "seconds": 0.0, "offset": 0, "objects": 0}
+    if detail["offset"]:
+        print(f"Resuming {name} after {detail['objects']:,} objects")
+
+    reader = JsonArrayReader(path, detail["offset"])
+    start_objects, start_rows = detail["objects"], dict(detail["rows"])
+    started = time.perf_counter()
+    start_seconds = detail["seconds"]
+    last_commit = reader.count
+
+    def checkpoint(counts, final):
+        nonlocal last_commit
+        if not final and reader.count - last_commit < chunk_rows:
+            return
+        detail["offset"] = reader.offset
+        detail["objects"] = start_objects + reader.count
+        detail["rows"] = {t: start_rows.get(t, 0) + n for t, n in counts.items()}
+        detail["seconds"] = start_seconds + time.perf_counter() - started
+        state.save(name, "done" if final else "running", detail)
+        state.conn.commit()
+        last_commit = reader.count
+
+    # Checkpoints can only happen between batches, so batches are no bigger than a chunk
+    insert_bulk_records(state.conn, bulk_type, reader, checkpoint, min(INSERT_BATCH, chunk_rows))
+
+def languages_step(state):
+    """Run promote_only_language_printings once per build, recording the rows it moved"""
+    if state.is_done("languages"):
+        print("Skipping languages (already done)")
+        return
+    start = time.perf_counter()
+    moved = promote_only_language_printings(state.conn)
+    state.save("languages", "done", {"rows": {"cards_raw": moved}, "seconds": time.perf_counter() - start})
+    state.conn.commit()
+
+def create_tables(conn, bulk_types):
+    """Create empty tables for the selected bulk types, replacing the previous build's"""
+    if any(t in CARD_BULK_TYPES for t in bulk_types):
+        create_raw_table(conn)
+        if "all_cards" in bulk_types:
+            create_intl_table(conn)
+    if "rulings" in bulk_types:
+        create_rulings_table(conn)
     conn.commit()
-else:
-    print("Skipping structured table creation (SQL file not found)")
 
-conn.close()
+def create_all_indexes(conn):
+    """Indexes on the structured cards table and the bulk tables"""
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    if "cards" in tables:
+        create_structured_indexes(conn)
+    create_bulk_indexes(conn)
+
+def rebuild_structured_table(conn):
+    """Drop and recreate the structured cards table (without indexes) from cards_raw"""
+    conn.execute("DROP TABLE IF EXISTS cards")
+    create_structured_table(conn, indexes=False)
+
+def update_stats(conn, has_cards):
+    """Price snapshot and query planner statistics"""
+    if has_cards:
+        record_price_snapshot(conn)
+    print("Analyzing tables...")
+    conn.execute("ANALYZE")
+    conn.commit()
+
+def build(bulk_types, db_path=DB_PATH, bulk_dir=BULK_DIR, download=True, restart=False,
+          chunk_rows=CHECKPOINT_ROWS):
+    """Build db_path from the selected bulk types in resumable stages and return a report.
+
+    Stages: download, ingest (committed in chunks), moving only-language
+    printings into cards_raw (with all_cards), structured extraction,
+    indexing and stats. Progress is kept in the build_state table, so a build
+    that died partway is continued by the next run with the same bulk files.
+    Only the tables for the selected types are replaced: a rulings-only build
+    keeps the existing cards, and a cards-only build keeps existing rulings.
+    """
+    bulk_types = [t for t in BULK_TYPES if t in bulk_types]
+    has_cards = any(t in CARD_BULK_TYPES for t in bulk_types)
+
+    print("Creating database...")
+    conn = sqlite3.connect(db_path)
+    state = BuildState(conn)
+
+    if download:
+        metadata = fetch_bulk_metadata()
+        versions = {t: metadata[t]["updated_at"] for t in bulk_types}
+    else:
+        bulk_files = {t: os.path.join(bulk_dir, f"{t}.json") for t in bulk_types}
+        versions = {t: [os.path.getsize(p), int(os.path.getmtime(p))] for t, p in bulk_files.items()}
+    plan = {"types": bulk_types, "versions": versions}
+    if state.begin(plan, restart):
+        print("Resuming the previous unfinished build...")
+
+    # Stage 1: download
+    if download:
+        bulk_files = {t: download_step(state, metadata[t], bulk_dir) for t in bulk_types}
+
+    # Stage 2: raw ingest, committed in chunks
+    run_step(state, "tables", create_tables, conn, bulk_types)
+    for bulk_type in bulk_types:
+        ingest_step(state, bulk_type, bulk_files[bulk_type], chunk_rows)
+    if "all_cards" in bulk_types:
+        languages_step(state)
+
+    # Stage 3: structured extraction
+    if has_cards:
+        run_step(state, "structured", rebuild_structured_table, conn)
+
+    # Stage 4: indexing
+    run_step(state, "indexes", create_all_indexes, conn)
+
+    # Stage 5: price snapshot and planner statistics
+    run_step(state, "stats", update_stats, conn, has_cards)
+
+    # Stamp the build so readers can invalidate their caches
+    write_build_info(conn)
+    state.finish(plan)
+
+    steps = [f"download:{t}" for t in bulk_types if download] + ["tables"]
+    steps += [f"ingest:{t}" for t in bulk_types] + ["languages", "structured", "indexes", "stats"]
+    report = {}
+    for step in steps:
+        status, detail = state.get(step)
+        if status:
+            report[step] = {"rows": detail.get("rows", {}), "seconds": detail.get("seconds", 0.0)}
+    conn.close()
+    return report
+
+def print_report(report):
+    """Print rows and timings per bulk type and build step"""
+    print()
+    print(f"{'Step':<22} {'Seconds':>9} {'Rows/s':>10}  Rows")
+    for name, entry in report.items():
+        rows = sum(entry["rows"].values())
+        rate = f"{rows / entry['seconds']:,.0f}" if rows and entry["seconds"] else ""
+        detail = ", ".join(f"{table}={count:,}" for table, count in entry["rows"].items())
+        print(f"{name:<22} {entry['seconds']:>9.2f} {rate:>10}  {detail}".rstrip())
+    print(f"{'total':<22} {sum(e['seconds'] for e in report.values()):>9.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Build mtg.db from Scryfall bulk data")
+    parser.add_argument("--types", nargs="+", choices=BULK_TYPES, default=["default_cards"],
+                        help="bulk files to load (default: default_cards)")
+    parser.add_argument("--db", default=DB_PATH, help="database path")
+    parser.add_argument("--bulk-dir", default=BULK_DIR, help="where bulk files are downloaded")
+    parser.add_argument("--skip-download", action="store_true",
+                        help="reuse bulk files already in --bulk-dir")
+    parser.add_argument("--restart", action="store_true",
+                        help="start over instead of resuming an unfinished build")
+    parser.add_argument("--chunk-rows", type=int, default=CHECKPOINT_ROWS,
+                        help="bulk file objects per committed ingest chunk")
+    args = parser.parse_args()
+    if args.chunk_rows < 1:
+        parser.error("--chunk-rows must be at least 1")
+
+    report = build(args.types, args.db, args.bulk_dir, download=not args.skip_download,
+                   restart=args.restart, chunk_rows=args.chunk_rows)
+    print_report(report)
+
+    print(f"Database saved to {args.db}")
+    print("Database build complete!")
 
-print(f"Database saved to {DB_PATH}")
-print("Database build complete!")
+if __name__ == "__main__":
+    main()
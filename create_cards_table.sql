@@ -48,12 +48,15 @@ SELECT
     json_extract(json, '$.penny_rank') AS penny_rank,
 
 
-    json_extract(json, '$.image_uris.small') AS image_small,
-    json_extract(json, '$.image_uris.normal') AS image_normal,
-    json_extract(json, '$.image_uris.large') AS image_large,
-    json_extract(json, '$.image_uris.png') AS image_png,
-    json_extract(json, '$.image_uris.art_crop') AS image_art_crop,
-    json_extract(json, '$.image_uris.border_crop') AS image_border_crop,
+    COALESCE(json_extract(json, '$.image_uris.small'), json_extract(json, '$.card_faces[0].image_uris.small')) AS image_small,
+    COALESCE(json_extract(json, '$.image_uris.normal'), json_extract(json, '$.card_faces[0].image_uris.normal')) AS image_normal,
+    COALESCE(json_extract(json, '$.image_uris.large'), json_extract(json, '$.card_faces[0].image_uris.large')) AS image_large,
+    COALESCE(json_extract(json, '$.image_uris.png'), json_extract(json, '$.card_faces[0].image_uris.png')) AS image_png,
+    COALESCE(json_extract(json, '$.image_uris.art_crop'), json_extract(json, '$.card_faces[0].image_uris.art_crop')) AS image_art_crop,
+    COALESCE(json_extract(json, '$.image_uris.border_crop'), json_extract(json, '$.card_faces[0].image_uris.border_crop')) AS image_border_crop,
+    json_extract(json, '$.card_faces[1].image_uris.small') AS image_back_small,
+    json_extract(json, '$.card_faces[1].image_uris.normal') AS image_back_normal,
+    json_extract(json, '$.card_faces[1].image_uris.large') AS image_back_large,
 
     json_extract(json, '$.prices.usd') AS price_usd,
     json_extract(json, '$.prices.eur') AS price_eur,
@@ -68,4 +71,7 @@ SELECT
     json_extract(json, '$.purchase_uris.tcgplayer') AS purchase_tcgplayer,
     json_extract(json, '$.purchase_uris.cardmarket') AS purchase_cardmarket
 
-FROM cards_raw;
\ No newline at end of file
+FROM cards_raw;
+
+CREATE INDEX IF NOT EXISTS idx_cards_card_id ON cards(card_id);
+CREATE INDEX IF NOT EXISTS idx_cards_name ON cards(name COLLATE NOCASE);
@@ -0,0 +1,208 @@
+"""Batch deck analytics over all pulled Moxfield decks.
+
+Computes mana curve, color pips, land count, total price and format legality
+for every deck in moxfield_raw in one pass: SQLite's json_each explodes the
+deck boards into card rows joined against cards/cards_raw, and pandas
+aggregates them per deck. Results go to the deck_stats table and are only
+recomputed for decks whose JSON changed, or for all decks when the cards
+table (prices, legalities) was rebuilt.
+
+Usage:
+    python deck_stats.py          # update changed decks
+    python deck_stats.py --full   # recompute every deck
+"""
+import hashlib
+import sqlite3
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+DB_PATH = "mtg.db"
+COLORS = ["W", "U", "B", "R", "G"]
+# Mana values 0-6 get their own bucket; 7 holds 7 and above
+CURVE_BUCKETS = list(range(8))
+BOARDS = ["mainboard", "commanders"]
+
+DECK_CARDS_QUERY = """
+    SELECT
+        d.deck_id,
+        e.key AS card_name,
+        CAST(json_extract(e.value, '$.quantity') AS INTEGER) AS quantity,
+        COALESCE(c.cmc, json_extract(e.value, '$.card.cmc')) AS cmc,
+        COALESCE(c.type_line, json_extract(e.value, '$.card.type_line')) AS type_line,
+        COALESCE(c.mana_cost, json_extract(e.value, '$.card.mana_cost')) AS mana_cost,
+        CAST(COALESCE(c.price_usd, json_extract(e.value, '$.card.prices.usd')) AS REAL) AS price_usd,
+        COALESCE(json_extract(cr.json, '$.legalities.' || d.format),
+                 json_extract(e.value, '$.card.legalities.' || d.format)) AS legality
+    FROM temp.decks_to_update d
+    JOIN moxfield_raw m ON m.deck_id = d.deck_id
+    JOIN json_each(m.data, '$.' || d.board) e
+    LEFT JOIN {cards} c ON c.card_id = json_extract(e.value, '$.card.scryfall_id')
+    LEFT JOIN {cards_raw} cr ON cr.id = json_extract(e.value, '$.card.scryfall_id')
+"""
+# Empty stand-ins joined instead of cards/cards_raw when the database has no Scryfall data,
+# so every column falls back to the card data embedded in the Moxfield JSON
+EMPTY_CARDS = "(SELECT NULL AS card_id, NULL AS cmc, NULL AS type_line, NULL AS mana_cost, NULL AS price_usd WHERE 0)"
+EMPTY_CARDS_RAW = "(SELECT NULL AS id, NULL AS json WHERE 0)"
+
+def _sha1(text):
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+
+def create_deck_stats_table(conn):
+    """Create deck_stats and its bookkeeping table if they do not exist"""
+    curve_columns = ",\n        ".join(f"curve_{b} INTEGER" for b in CURVE_BUCKETS)
+    pip_columns = ",\n        ".join(f"pips_{c.lower()} INTEGER" for c in COLORS)
+    conn.execute(f"""
+    CREATE TABLE IF NOT EXISTS deck_stats (
+        deck_id TEXT PRIMARY KEY,
+        username TEXT,
+        deck_name TEXT,
+        format TEXT,
+        data_hash TEXT,
+        card_count INTEGER,
+        land_count INTEGER,
+        nonland_count INTEGER,
+        avg_cmc REAL,
+        {curve_columns},
+        {pip_columns},
+        colors TEXT,
+        total_price_usd REAL,
+        unpriced_cards INTEGER,
+        illegal_cards INTEGER,
+        is_legal INTEGER,
+        computed_at TEXT
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS deck_stats_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+    """)
+
+def cards_signature(conn):
+    """Cheap fingerprint of the card data deck stats depend on (changes on rebuild)"""
+    try:
+        count, total = conn.execute(
+            "SELECT COUNT(*), TOTAL(CAST(price_usd AS REAL)) FROM cards").fetchone()
+    except sqlite3.OperationalError:
+        return "no-cards"
+    return f"{count}:{total:.2f}"
+
+def deck_cards_query(conn):
+    """DECK_CARDS_QUERY joined against cards/cards_raw, or empty stand-ins for missing tables"""
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    return DECK_CARDS_QUERY.format(cards="cards" if "cards" in tables else EMPTY_CARDS,
+                                   cards_raw="cards_raw" if "cards_raw" in tables else EMPTY_CARDS_RAW)
+
+def aggregate(rows):
+    """Per-deck metrics DataFrame from exploded (deck_id, card...) rows"""
+    df = rows.copy()
+    df["quantity"] = df["quantity"].fillna(1).astype(int)
+    df["cmc"] = pd.to_numeric(df["cmc"], errors="coerce").fillna(0)
+    front_type = df["type_line"].fillna("").str.split(" // ").str[0]
+    df["is_land"] = front_type.str.contains("Land")
+    df["mana_cost"] = df["mana_cost"].fillna("")
+
+    qty = df["quantity"]
+    land_qty = qty.where(df["is_land"], 0)
+    nonland_qty = qty - land_qty
+    df["land_qty"] = land_qty
+    df["nonland_qty"] = nonland_qty
+    df["cmc_total"] = df["cmc"] * nonland_qty
+    df["price_total"] = df["price_usd"].fillna(0) * qty
+    df["unpriced"] = qty.where(df["price_usd"].isna(), 0)
+    illegal = df["legality"].notna() & ~df["legality"].isin(["legal", "restricted"])
+    df["illegal"] = qty.where(illegal, 0)
+    df["has_legality"] = df["legality"].notna()
+
+    for color in COLORS:
+        # A pip is any {...} symbol containing the color, so hybrid {W/U} counts for both
+        df[f"pips_{color.lower()}"] = df["mana_cost"].str.count(r"\{[^}]*" + color + r"[^}]*\}") * qty
+
+    bucket = df["cmc"].clip(upper=CURVE_BUCKETS[-1]).astype(int)
+    for b in CURVE_BUCKETS:
+        df[f"curve_{b}"] = nonland_qty.where(bucket == b, 0)
+
+    sums = [f"curve_{b}" for b in CURVE_BUCKETS] + [f"pips_{c.lower()}" for c in COLORS]
+    grouped = df.groupby("deck_id").agg(
+        card_count=("quantity", "sum"),
+        land_count=("land_qty", "sum"),
+        nonland_count=("nonland_qty", "sum"),
+        cmc_total=("cmc_total", "sum"),
+        total_price_usd=("price_total", "sum"),
+        unpriced_cards=("unpriced", "sum"),
+        illegal_cards=("illegal", "sum"),
+        has_legality=("has_legality", "any"),
+        **{col: (col, "sum") for col in sums},
+    )
+
+    grouped["avg_cmc"] = (grouped["cmc_total"] / grouped["nonland_count"].where(grouped["nonland_count"] > 0)).round(2)
+    grouped["total_price_usd"] = grouped["total_price_usd"].round(2)
+    pip_columns = [f"pips_{c.lower()}" for c in COLORS]
+    grouped["colors"] = (grouped[pip_columns] > 0).apply(
+        lambda row: "".join(c for c, present in zip(COLORS, row) if present), axis=1)
+    grouped["is_legal"] = (grouped["illegal_cards"] == 0).astype("Int64").where(grouped["has_legality"])
+    return grouped.drop(columns=["cmc_total", "has_legality"]).reset_index()
+
+def update_deck_stats(conn, full=False):
+    """Recompute deck_stats for new or changed decks (all decks if full). Returns decks updated."""
+    create_deck_stats_table(conn)
+    conn.create_function("sha1", 1, _sha1, deterministic=True)
+
+    signature = cards_signature(conn)
+    row = conn.execute("SELECT value FROM deck_stats_meta WHERE key = 'cards_signature'").fetchone()
+    if row is None or row[0] != signature:
+        full = True
+
+    conn.execute("DROP TABLE IF EXISTS temp.decks_to_update")
+    boards = " UNION ALL ".join(f"SELECT '{board}' AS board" for board in BOARDS)
+    conn.execute(f"""
+    CREATE TEMP TABLE decks_to_update AS
+    SELECT
+        m.deck_id,
+        m.username,
+        json_extract(m.data, '$.name') AS deck_name,
+        json_extract(m.data, '$.format') AS format,
+        sha1(m.data) AS data_hash,
+        b.board
+    FROM moxfield_raw m
+    LEFT JOIN deck_stats s ON s.deck_id = m.deck_id
+    CROSS JOIN ({boards}) b
+    WHERE ? OR s.data_hash IS NULL OR s.data_hash != sha1(m.data)
+    """, (1 if full else 0,))
+
+    decks = pd.read_sql_query("""
+        SELECT DISTINCT deck_id, username, deck_name, format, data_hash FROM temp.decks_to_update
+    """, conn)
+
+    # Drop stats for decks that are no longer in moxfield_raw
+    conn.execute("DELETE FROM deck_stats WHERE deck_id NOT IN (SELECT deck_id FROM moxfield_raw)")
+
+    if not decks.empty:
+        rows = pd.read_sql_query(deck_cards_query(conn), conn)
+        # Decks with no cards get empty metrics; with only such decks there is nothing to aggregate
+        stats = decks.merge(aggregate(rows), on="deck_id", how="left") if not rows.empty else decks.copy()
+        stats["computed_at"] = datetime.now().isoformat(timespec="seconds")
+
+        columns = [r[1] for r in conn.execute("PRAGMA table_info(deck_stats)")]
+        stats = stats.reindex(columns=columns)
+        records = [tuple(None if pd.isna(v) else (v.item() if hasattr(v, "item") else v) for v in row)
+                   for row in stats.itertuples(index=False)]
+        conn.executemany(f"""
+            INSERT OR REPLACE INTO deck_stats ({", ".join(columns)})
+            VALUES ({", ".join("?" for _ in columns)})
+        """, records)
+
+    conn.execute("INSERT OR REPLACE INTO deck_stats_meta (key, value) VALUES ('cards_signature', ?)",
+                 (signature,))
+    conn.execute("DROP TABLE temp.decks_to_update")
+    conn.commit()
+    return len(decks)
+
+if __name__ == "__main__":
+    conn = sqlite3.connect(DB_PATH)
+    updated = update_deck_stats(conn, full="--full" in sys.argv)
+    conn.close()
+    print(f"Updated stats for {updated} decks.")
@@ -0,0 +1,97 @@
+"""Check deck_stats.update_deck_stats on small in-memory databases.
+
+Covers the cases that are easy to break: decks without any cards (alone and
+next to ordinary decks), incremental runs after an empty deck is edited, and
+databases with Moxfield decks but no Scryfall tables, where card data comes
+from the deck JSON.
+
+Usage:
+    python deck_stats_check.py
+"""
+import json
+import os
+import sqlite3
+import sys
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def new_database(decks):
+    """In-memory database holding only moxfield_raw with the given (deck_id, username, data) decks"""
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE moxfield_raw (deck_id TEXT PRIMARY KEY, username TEXT, data JSON)")
+    conn.executemany("INSERT INTO moxfield_raw VALUES (?, ?, ?)",
+                     [(deck_id, username, json.dumps(data)) for deck_id, username, data in decks])
+    conn.commit()
+    return conn
+
+def empty_deck(name):
+    return {"name": name, "format": "commander", "mainboard": {}, "commanders": {}}
+
+def stored(conn, deck_id):
+    """(deck_name, card_count, data_hash) saved for a deck, or None"""
+    return conn.execute("SELECT deck_name, card_count, data_hash FROM deck_stats WHERE deck_id = ?",
+                        (deck_id,)).fetchone()
+
+def check_only_empty_deck():
+    import deck_stats
+
+    conn = new_database([("empty", "someone", empty_deck("Nothing Yet"))])
+    problems = []
+    updated = deck_stats.update_deck_stats(conn)
+    row = stored(conn, "empty")
+    if updated != 1 or row is None or row[2] is None:
+        problems.append(f"first run updated {updated} decks and stored {row}")
+
+    # Edit the empty deck: the incremental run must pick it up, then settle
+    conn.execute("UPDATE moxfield_raw SET data = ? WHERE deck_id = 'empty'", (json.dumps(empty_deck("Renamed")),))
+    updated = deck_stats.update_deck_stats(conn)
+    row = stored(conn, "empty")
+    if updated != 1 or row is None or row[0] != "Renamed":
+        problems.append(f"run after renaming updated {updated} decks and stored {row}")
+    updated = deck_stats.update_deck_stats(conn)
+    if updated != 0:
+        problems.append(f"run with nothing changed updated {updated} decks")
+    return problems
+
+def check_empty_with_other_decks():
+    import deck_stats
+    from synthetic_data import generate_cards, generate_decks
+
+    decks = list(generate_decks(5, list(generate_cards(2000)))) + [("empty", "someone", empty_deck("Nothing Yet"))]
+    conn = new_database(decks)
+    problems = []
+    updated = deck_stats.update_deck_stats(conn)
+    if updated != len(decks):
+        problems.append(f"updated {updated} of {len(decks)} decks")
+    for deck_id, _, data in decks:
+        expected = sum(entry["quantity"] for board in deck_stats.BOARDS
+                       for entry in data.get(board, {}).values()) or None
+        row = stored(conn, deck_id)
+        if row is None or row[1] != expected:
+            problems.append(f"{deck_id}: card_count {row and row[1]}, expected {expected}")
+    # Without a cards table the embedded Moxfield card data must still give prices and curves
+    priced = conn.execute("SELECT COUNT(*) FROM deck_stats WHERE total_price_usd > 0 AND avg_cmc > 0").fetchone()[0]
+    if priced != len(decks) - 1:
+        problems.append(f"{priced} of {len(decks) - 1} non-empty decks got prices and mana values")
+    return problems
+
+def main():
+    sys.path.insert(0, REPO_DIR)
+    checks = [
+        ("only an empty deck, then renamed", check_only_empty_deck),
+        ("empty deck next to others, no cards table", check_empty_with_other_decks),
+    ]
+    failures = 0
+    for name, check in checks:
+        print(f"Checking {name}...")
+        problems = check()
+        failures += bool(problems)
+        print(f"  {'FAIL' if problems else 'ok'}")
+        for problem in problems:
+            print(f"  {problem}")
+
+    print(f"{len(checks) - failures}/{len(checks)} checks passed")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""Local on-disk cache for Scryfall card images.
+
+Images are fetched with bounded concurrency and a request rate limit, stored
+content-addressed (by SHA-256) under the cache directory and evicted least
+recently used first once the cache grows past its size cap. An SQLite index
+in the cache directory maps URLs to blobs and tracks access times.
+
+    cache = ImageCache("image_cache", max_bytes=200 * 1024 * 1024)
+    cache.prefetch(urls)          # background fetch, returns futures
+    path = cache.get(url)         # local file path (fetching if needed) or None
+"""
+import base64
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+
+DEFAULT_CACHE_DIR = "image_cache"
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+# Scryfall asks clients to keep to about 10 requests per second
+DEFAULT_REQUESTS_PER_SECOND = 10
+DEFAULT_MAX_WORKERS = 8
+# Seconds a URL that failed to download is skipped before it is tried again
+FAILURE_TTL = 300
+IMAGE_SIZES = ["small", "normal", "large", "png", "art_crop", "border_crop"]
+
+def card_image_urls(card, size="normal"):
+    """Image URLs for a Scryfall card dict: one for single-faced cards, one per face otherwise"""
+    if size not in IMAGE_SIZES:
+        raise ValueError(f"size must be one of {', '.join(IMAGE_SIZES)}")
+    if card.get("image_uris"):
+        url = card["image_uris"].get(size)
+        return [url] if url else []
+    urls = []
+    for face in card.get("card_faces") or []:
+        url = (face.get("image_uris") or {}).get(size)
+        if url:
+            urls.append(url)
+    return urls
+
+class RateLimiter:
+    """Token bucket allowing `rate` acquisitions per second with bursts up to `burst`"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class ImageCache:
+    """Content-addressed image cache with LRU eviction and concurrent prefetch"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES,
+                 max_workers=DEFAULT_MAX_WORKERS, requests_per_second=DEFAULT_REQUESTS_PER_SECOND,
+                 timeout=10, session=None, failure_ttl=FAILURE_TTL):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.session.headers.setdefault("User-Agent", "mtg-db-image-cache/1.0")
+        self.limiter = RateLimiter(requests_per_second)
+        # Caps simultaneous downloads across prefetch workers and direct get() calls
+        self.slots = threading.BoundedSemaphore(max_workers)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-cache")
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        # url -> monotonic time of its last failed download
+        self.failure_ttl = failure_ttl
+        self.failures = {}
+        self.stats = {"hits": 0, "misses": 0, "errors": 0, "evictions": 0, "oversized": 0, "skipped": 0}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(cache_dir, "index.db"), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                content_type TEXT,
+                last_access REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_blobs_last_access ON blobs(last_access)")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL REFERENCES blobs(digest)
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_urls_digest ON urls(digest)")
+        self.conn.commit()
+
+    def blob_path(self, digest):
+        """On-disk path for a blob digest"""
+        return os.path.join(self.cache_dir, digest[:2], digest)
+
+    def lookup(self, url):
+        """Local path for a cached URL (marking it recently used), or None"""
+        with self.lock:
+            row = self.conn.execute("""
+                SELECT b.digest FROM urls u JOIN blobs b ON b.digest = u.digest WHERE u.url = ?
+            """, (url,)).fetchone()
+            if row is None:
+                return None
+            path = self.blob_path(row[0])
+            if not os.path.exists(path):
+                # Blob removed behind our back; forget it so it is fetched again
+                self.conn.execute("DELETE FROM urls WHERE digest = ?", (row[0],))
+                self.conn.execute("DELETE FROM blobs WHERE digest = ?", (row[0],))
+                self.conn.commit()
+                return None
+            self.conn.execute("UPDATE blobs SET last_access = ? WHERE digest = ?", (time.time(), row[0]))
+            self.conn.commit()
+            return path
+
+    def get(self, url):
+        """Local path for url, downloading it first if needed; None if it cannot be fetched"""
+        if not url:
+            return None
+        path = self.lookup(url)
+        if path:
+            with self.lock:
+                self.stats["hits"] += 1
+            return path
+        return self.prefetch([url])[0].result()
+
+    def prefetch(self, urls):
+        """Fetch uncached urls in the background; returns one future per url resolving to a path.
+
+        URLs that failed within the last failure_ttl seconds resolve to None
+        without another request.
+        """
+        futures = []
+        for url in urls:
+            with self.lock:
+                future = self.in_flight.get(url)
+                if future is None and self._failed_recently(url):
+                    self.stats["skipped"] += 1
+                    future = Future()
+                    future.set_result(None)
+                elif future is None:
+                    future = self.executor.submit(self._fetch, url)
+                    self.in_flight[url] = future
+            futures.append(future)
+        return futures
+
+    def _failed_recently(self, url):
+        """Whether url failed within failure_ttl seconds (call with self.lock held)"""
+        failed_at = self.failures.get(url)
+        if failed_at is None:
+            return False
+        if time.monotonic() - failed_at < self.failure_ttl:
+            return True
+        del self.failures[url]
+        return False
+
+    def _fetch(self, url):
+        try:
+            path = self.lookup(url)
+            if path:
+                with self.lock:
+                    self.stats["hits"] += 1
+                return path
+
+            with self.slots:
+                self.limiter.acquire()
+                try:
+                    response = self.session.get(url, timeout=self.timeout)
+                    response.raise_for_status()
+                except requests.RequestException:
+                    with self.lock:
+                        self.stats["errors"] += 1
+                        self.failures[url] = time.monotonic()
+                    return None
+            with self.lock:
+                self.stats["misses"] += 1
+            return self.store(url, response.content, response.headers.get("Content-Type"))
+        finally:
+            with self.lock:
+                self.in_flight.pop(url, None)
+
+    def store(self, url, content, content_type=None):
+        """Add downloaded content for url to the cache and return its path.
+
+        Returns None for content larger than the whole cache, which is not stored.
+        """
+        if len(content) > self.max_bytes:
+            with self.lock:
+                self.stats["oversized"] += 1
+            return None
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file first so readers never see a partial image
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+        with self.lock:
+            self.conn.execute("""
+                INSERT INTO blobs (digest, size, content_type, last_access) VALUES (?, ?, ?, ?)
+                ON CONFLICT(digest) DO UPDATE SET last_access = excluded.last_access
+            """, (digest, len(content), content_type, time.time()))
+            self.conn.execute("INSERT OR REPLACE INTO urls (url, digest) VALUES (?, ?)", (url, digest))
+            self.conn.commit()
+        self.evict()
+        return path
+
+    def total_bytes(self):
+        """Total size of cached blobs"""
+        with self.lock:
+            return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def evict(self):
+        """Delete least recently used blobs until the cache is under max_bytes"""
+        with self.lock:
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for digest, size in self.conn.execute("SELECT digest, size FROM blobs ORDER BY last_access"):
+                if total <= self.max_bytes:
+                    break
+                victims.append(digest)
+                total -= size
+            for digest in victims:
+                self.conn.execute("DELETE FROM urls WHERE digest = ?", (digest,))
+                self.conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+            self.conn.commit()
+            self.stats["evictions"] += len(victims)
+
+        for digest in victims:
+            try:
+                os.remove(self.blob_path(digest))
+            except FileNotFoundError:
+                pass
+
+    def data_uri(self, url):
+        """Cached image as a data: URI (for st.column_config.ImageColumn), or None if not cached"""
+        path = self.lookup(url)
+        if not path:
+            return None
+        with self.lock:
+            row = self.conn.execute("SELECT content_type FROM urls u JOIN blobs b ON b.digest = u.digest "
+                                    "WHERE u.url = ?", (url,)).fetchone()
+        content_type = (row and row[0]) or "image/jpeg"
+        with open(path, "rb") as f:
+            return f"data:{content_type};base64,{base64.b64encode(f.read()).decode('ascii')}"
+
+    def close(self):
+        """Stop prefetch workers and close the index"""
+        self.executor.shutdown(wait=True)
+        self.conn.close()
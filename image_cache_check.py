@@ -0,0 +1,257 @@
+"""Check image_cache.ImageCache against a local stand-in image server.
+
+Starts an http.server on localhost that serves deterministic fake images
+slowly (so requests overlap) and records every request, then checks:
+
+- concurrency cap: never more simultaneous downloads than max_workers
+- rate limit: downloads start no faster than requests_per_second allows
+- in-flight dedup: many concurrent requests for one URL make one download
+- content-address dedup: two URLs with identical bytes share one blob
+- LRU eviction: the least recently used image goes first when over the cap
+- oversized images: content larger than the cache is not stored
+- failed downloads: a failing URL is not requested again until failure_ttl passes
+
+Usage:
+    python image_cache_check.py
+"""
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGE_BYTES = 10_000
+
+class StandInServer(ThreadingHTTPServer):
+    """Image server recording request paths, start times and peak concurrency"""
+
+    daemon_threads = True
+
+    def __init__(self, delay):
+        super().__init__(("127.0.0.1", 0), ImageHandler)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.requests = Counter()
+        self.started = []
+        self.active = 0
+        self.peak = 0
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def reset(self):
+        with self.lock:
+            self.requests.clear()
+            self.started.clear()
+            self.peak = 0
+
+def image_body(path):
+    """Fake image bytes for a path; /same/* paths all share one body, /big/* is oversized"""
+    if path.startswith("/big/"):
+        return b"B" * (IMAGE_BYTES * 100)
+    key = "same" if path.startswith("/same/") else path
+    return hashlib.sha256(key.encode("utf-8")).digest() * (IMAGE_BYTES // 32)
+
+class ImageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests[self.path] += 1
+            server.started.append(time.monotonic())
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            time.sleep(server.delay)
+            if self.path.startswith("/missing/"):
+                self.send_error(404)
+                return
+            body = image_body(self.path)
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+def check_concurrency_and_rate(server, cache_dir, workers, rate, count):
+    from image_cache import ImageCache
+
+    cache = ImageCache(cache_dir, max_workers=workers, requests_per_second=rate)
+    urls = [f"{server.base_url}/card/{i}.jpg" for i in range(count)]
+    start = time.monotonic()
+    paths = [f.result() for f in cache.prefetch(urls)]
+    elapsed = time.monotonic() - start
+    cache.close()
+
+    problems = []
+    if not all(paths) or not all(os.path.exists(p) for p in paths):
+        problems.append("some prefetched images have no cached file")
+    if server.peak > workers:
+        problems.append(f"{server.peak} simultaneous downloads with max_workers={workers}")
+    # The token bucket allows a burst of `rate` requests, then `rate` per second
+    min_elapsed = (count - rate) / rate
+    if elapsed < min_elapsed * 0.9:
+        problems.append(f"{count} downloads took {elapsed:.2f}s, rate limit implies at least {min_elapsed:.2f}s")
+    started = sorted(server.started)
+    for i in range(len(started) - 2 * rate):
+        # Any window of one second sees at most a full bucket plus one second of refill
+        if started[i + 2 * rate] - started[i] < 1.0 * 0.9:
+            problems.append(f"more than {2 * rate} downloads started within one second")
+            break
+    print(f"  {count} downloads in {elapsed:.2f}s, peak concurrency {server.peak}/{workers}")
+    return problems
+
+def check_in_flight_dedup(server, cache_dir):
+    from image_cache import ImageCache
+
+    cache = ImageCache(cache_dir, max_workers=8, requests_per_second=100)
+    url = f"{server.base_url}/card/dedup.jpg"
+    futures = cache.prefetch([url] * 20)
+    threads = [threading.Thread(target=cache.get, args=(url,)) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    paths = {f.result() for f in futures}
+    cache.close()
+
+    problems = []
+    if server.requests[f"/card/dedup.jpg"] != 1:
+        problems.append(f"one URL requested concurrently was downloaded {server.requests['/card/dedup.jpg']} times")
+    if len(paths) != 1:
+        problems.append(f"concurrent requests for one URL got {len(paths)} different paths")
+    return problems
+
+def check_content_dedup(server, cache_dir):
+    from image_cache import ImageCache
+
+    cache = ImageCache(cache_dir, requests_per_second=100)
+    first = cache.get(f"{server.base_url}/same/a.jpg")
+    second = cache.get(f"{server.base_url}/same/b.jpg")
+    blobs = cache.conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+    urls = cache.conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+    cache.close()
+
+    problems = []
+    if first != second:
+        problems.append("identical images from two URLs were stored as two files")
+    if (blobs, urls) != (1, 2):
+        problems.append(f"expected 1 blob and 2 urls in the index, found {blobs} and {urls}")
+    return problems
+
+def check_lru_eviction(server, cache_dir):
+    from image_cache import ImageCache
+
+    # Room for two images but not three
+    cache = ImageCache(cache_dir, max_bytes=int(IMAGE_BYTES * 2.5), requests_per_second=100)
+    a, b, c = (f"{server.base_url}/lru/{name}.jpg" for name in "abc")
+    path_a = cache.get(a)
+    time.sleep(0.01)
+    path_b = cache.get(b)
+    time.sleep(0.01)
+    cache.lookup(a)  # a is now more recently used than b
+    time.sleep(0.01)
+    path_c = cache.get(c)
+    state = {name: (cache.lookup(url) is not None, os.path.exists(path))
+             for name, url, path in [("a", a, path_a), ("b", b, path_b), ("c", c, path_c)]}
+    total, evictions = cache.total_bytes(), cache.stats["evictions"]
+    cache.close()
+
+    problems = []
+    expected = {"a": (True, True), "b": (False, False), "c": (True, True)}
+    if state != expected:
+        problems.append(f"after evicting, cached (indexed, on disk) was {state}, expected {expected}")
+    if total > IMAGE_BYTES * 2.5 or evictions != 1:
+        problems.append(f"cache holds {total} bytes after {evictions} evictions")
+    return problems
+
+def check_oversized(server, cache_dir):
+    from image_cache import ImageCache
+
+    cache = ImageCache(cache_dir, max_bytes=IMAGE_BYTES * 5, requests_per_second=100)
+    small = cache.get(f"{server.base_url}/card/kept.jpg")
+    big = cache.get(f"{server.base_url}/big/huge.jpg")
+    still_cached = cache.lookup(f"{server.base_url}/card/kept.jpg")
+    cache.close()
+
+    problems = []
+    if big is not None:
+        problems.append(f"oversized image returned path {big} (exists: {os.path.exists(big)})")
+    if not still_cached or still_cached != small:
+        problems.append("storing an oversized image evicted the rest of the cache")
+    return problems
+
+def check_failures(server, cache_dir):
+    from image_cache import ImageCache
+
+    cache = ImageCache(cache_dir, requests_per_second=100, failure_ttl=0.5)
+    url = f"{server.base_url}/missing/gone.jpg"
+    first = cache.get(url)
+    start = time.monotonic()
+    again = [cache.get(url) for _ in range(5)]
+    repeat_seconds = time.monotonic() - start
+    requests_within_ttl = server.requests["/missing/gone.jpg"]
+    time.sleep(0.6)
+    cache.get(url)
+    requests_after_ttl = server.requests["/missing/gone.jpg"]
+    cache.close()
+
+    problems = []
+    if first is not None or any(again):
+        problems.append("a URL answering 404 returned a cached path")
+    if requests_within_ttl != 1 or repeat_seconds > server.delay:
+        problems.append(f"failed URL requested {requests_within_ttl} times within failure_ttl "
+                        f"({repeat_seconds:.2f}s for 5 repeats)")
+    if requests_after_ttl != 2:
+        problems.append(f"failed URL requested {requests_after_ttl} times in total, expected a retry after failure_ttl")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Check ImageCache against a local stand-in image server")
+    parser.add_argument("--workers", type=int, default=4, help="max_workers for the concurrency check")
+    parser.add_argument("--rate", type=int, default=10, help="requests_per_second for the rate check")
+    parser.add_argument("--count", type=int, default=40, help="downloads in the concurrency/rate check")
+    parser.add_argument("--delay", type=float, default=0.2, help="seconds the server takes per image")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_DIR)
+    server = StandInServer(args.delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    checks = [
+        ("concurrency cap and rate limit",
+         lambda d: check_concurrency_and_rate(server, d, args.workers, args.rate, args.count)),
+        ("in-flight dedup", lambda d: check_in_flight_dedup(server, d)),
+        ("content-address dedup", lambda d: check_content_dedup(server, d)),
+        ("LRU eviction", lambda d: check_lru_eviction(server, d)),
+        ("oversized images", lambda d: check_oversized(server, d)),
+        ("failed downloads", lambda d: check_failures(server, d)),
+    ]
+    failures = 0
+    for name, check in checks:
+        server.reset()
+        print(f"Checking {name}...")
+        with tempfile.TemporaryDirectory(prefix="mtg-image-cache-") as cache_dir:
+            problems = check(cache_dir)
+        failures += bool(problems)
+        print(f"  {'FAIL' if problems else 'ok'}")
+        for problem in problems:
+            print(f"  {problem}")
+
+    server.shutdown()
+    print(f"{len(checks) - failures}/{len(checks)} checks passed")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
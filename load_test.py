@@ -0,0 +1,221 @@
+"""Load test for api_server.py.
+
+Runs asyncio keep-alive HTTP clients in several processes against a running
+server (or starts one with --start-server) and reports throughput, latency
+percentiles and status counts. Request targets are sampled from the database:
+single-card lookups, batch lookups, name lookups, searches and decks, with
+some requests revalidating via If-None-Match.
+
+Usage:
+    python load_test.py --start-server --server-workers 4 --clients 4 --concurrency 32 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+from collections import Counter
+from urllib.parse import quote
+
+DB_PATH = "mtg.db"
+DEFAULT_PORT = 8600
+
+# Relative weights of each request kind in the mix
+MIX = {
+    "card": 50,
+    "batch": 15,
+    "named": 15,
+    "search": 10,
+    "deck": 5,
+    "revalidate": 5,
+}
+
+def sample_targets(db_path, count, seed):
+    """Request targets per kind, sampled from the database"""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True)
+    ids = [r[0] for r in conn.execute("SELECT card_id FROM cards ORDER BY random() LIMIT ?", (count,))]
+    names = [r[0] for r in conn.execute("SELECT name FROM cards ORDER BY random() LIMIT ?", (count,))]
+    try:
+        decks = [r[0] for r in conn.execute("SELECT deck_id FROM moxfield_raw LIMIT ?", (count,))]
+    except sqlite3.OperationalError:
+        decks = []
+    conn.close()
+
+    words = ["draw", "creature", "target", "damage", "flying", "counter", "token", "graveyard"]
+    targets = {
+        "card": [f"/cards/{i}" for i in ids],
+        "batch": [f"/cards?ids={','.join(rng.sample(ids, min(len(ids), 20)))}" for _ in range(100)],
+        "named": [f"/cards/named?exact={quote(n)}" for n in names],
+        "search": [f"/search?q={w}&field=oracle_text&limit=50" for w in words],
+        "deck": [f"/decks/{d}" for d in decks],
+    }
+    targets["revalidate"] = targets["card"]
+    return {kind: t for kind, t in targets.items() if t}
+
+async def read_response(reader):
+    """Read one HTTP/1.1 response, returning (status, headers)"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers
+
+async def client(host, port, targets, kinds, weights, deadline, seed, results):
+    """One keep-alive connection issuing requests until the deadline"""
+    rng = random.Random(seed)
+    etags = {}
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            kind = rng.choices(kinds, weights)[0]
+            extra = ""
+            if kind == "revalidate" and etags:
+                # Conditional request for something this client already has
+                target = rng.choice(list(etags))
+                extra = f"If-None-Match: {etags[target]}\r\n"
+            else:
+                target = rng.choice(targets[kind])
+            request = f"GET {target} HTTP/1.1\r\nHost: {host}\r\n{extra}\r\n"
+
+            start = time.perf_counter()
+            writer.write(request.encode("latin-1"))
+            try:
+                status, headers = await read_response(reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                results["errors"] += 1
+                reader, writer = await asyncio.open_connection(host, port)
+                continue
+            results["latencies"].append(time.perf_counter() - start)
+            results["status"][status] += 1
+            results["kinds"][kind] += 1
+            if "etag" in headers:
+                etags[target] = headers["etag"]
+    finally:
+        writer.close()
+
+def run_client_process(host, port, targets, concurrency, duration, seed, out_queue):
+    """Entry point for one client process; puts its raw results on out_queue"""
+    results = {"latencies": [], "status": Counter(), "kinds": Counter(), "errors": 0}
+    kinds = list(targets)
+    weights = [MIX[k] for k in kinds]
+
+    async def main():
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(client(host, port, targets, kinds, weights, deadline, seed * 1000 + i, results)
+                               for i in range(concurrency)))
+
+    asyncio.run(main())
+    out_queue.put({"latencies": results["latencies"], "status": dict(results["status"]),
+                   "kinds": dict(results["kinds"]), "errors": results["errors"]})
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0.0
+
+def wait_for_server(host, port, timeout=30):
+    """Wait until the server answers /health"""
+    import urllib.request
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://{host}:{port}/health", timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    sys.exit(f"Server did not start on {host}:{port}")
+
+def run(db_path, host, port, clients, concurrency, duration, seed):
+    """Run the load test and return the summary dict"""
+    targets = sample_targets(db_path, 2000, seed)
+    out_queue = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=run_client_process,
+                                         args=(host, port, targets, concurrency, duration, seed + i, out_queue))
+                 for i in range(clients)]
+    start = time.perf_counter()
+    for p in processes:
+        p.start()
+    parts = [out_queue.get() for _ in processes]
+    for p in processes:
+        p.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = [lat for part in parts for lat in part["latencies"]]
+    status, kinds = Counter(), Counter()
+    for part in parts:
+        status.update(part["status"])
+        kinds.update(part["kinds"])
+    return {
+        "requests": len(latencies),
+        "duration_s": round(elapsed, 2),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "max": round(max(latencies, default=0) * 1000, 2),
+        },
+        "status": {str(k): v for k, v in sorted(status.items())},
+        "kinds": dict(kinds),
+        "errors": sum(part["errors"] for part in parts),
+        "clients": clients,
+        "concurrency_per_client": concurrency,
+        "cpu_count": os.cpu_count(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for api_server.py")
+    parser.add_argument("--db", default=DB_PATH, help="database to sample request targets from")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--clients", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="client processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="connections per client process")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--start-server", action="store_true", help="start api_server.py for the run")
+    parser.add_argument("--server-workers", type=int, default=1, help="server processes with --start-server")
+    parser.add_argument("--output", help="also write the summary to this JSON file")
+    args = parser.parse_args()
+
+    server = None
+    if args.start_server:
+        server_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "api_server.py")
+        server = subprocess.Popen([sys.executable, server_path, "--db", args.db, "--host", args.host,
+                                   "--port", str(args.port), "--workers", str(args.server_workers)])
+    try:
+        wait_for_server(args.host, args.port)
+        print(f"Running {args.clients} x {args.concurrency} connections for {args.duration:.0f}s...")
+        summary = run(args.db, args.host, args.port, args.clients, args.concurrency, args.duration, args.seed)
+        if server:
+            summary["server_workers"] = args.server_workers
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import requests
 import json
 import sqlite3
 import time
+import deck_stats
 
 DB_PATH = "mtg.db"  # adjust path if needed
 
@@ -69,4 +70,10 @@ if __name__ == "__main__":
             deck_id = deck["publicId"]
             deck_data = fetch_moxfield_deck(deck_id)
             if deck_data:
-                save_deck(deck_id, username, deck_data)
\ No newline at end of file
+                save_deck(deck_id, username, deck_data)
+
+    # Refresh per-deck analytics for new or changed decks
+    conn = sqlite3.connect(DB_PATH)
+    updated = deck_stats.update_deck_stats(conn)
+    conn.close()
+    print(f"Updated stats for {updated} decks.")
@@ -0,0 +1,129 @@
+"""Append-only daily price snapshots for the cards table.
+
+Each build appends one snapshot, storing only cards whose USD/EUR/TIX price
+changed since their last recorded value. Prices are integer cents and dates
+are integer day numbers (days since 1970-01-01), and card ids are mapped to
+small integer keys, so a row costs a few bytes instead of a 36-character id.
+
+Tables:
+    price_cards    card_key <-> Scryfall card_id
+    price_current  last recorded prices per card (what the next snapshot diffs against)
+    price_history  (card_key, day) -> prices, only on days a price changed
+"""
+from datetime import date
+
+from queries import PRICE_HISTORY_QUERY, price_history_params, price_movers_query
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+def to_day(value):
+    """Day number for a date or ISO date string"""
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal() - EPOCH_ORDINAL
+
+def from_day(day):
+    """Date for a day number"""
+    return date.fromordinal(day + EPOCH_ORDINAL)
+
+def create_price_tables(conn):
+    """Create the price history tables if they do not exist"""
+    cur = conn.cursor()
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS price_cards (
+        card_key INTEGER PRIMARY KEY,
+        card_id TEXT NOT NULL UNIQUE
+    )
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS price_current (
+        card_key INTEGER PRIMARY KEY,
+        day INTEGER NOT NULL,
+        usd INTEGER,
+        eur INTEGER,
+        tix INTEGER
+    )
+    """)
+    # The primary key doubles as the (card, date) index for range queries
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS price_history (
+        card_key INTEGER NOT NULL,
+        day INTEGER NOT NULL,
+        usd INTEGER,
+        eur INTEGER,
+        tix INTEGER,
+        PRIMARY KEY (card_key, day)
+    ) WITHOUT ROWID
+    """)
+
+def record_snapshot(conn, snapshot_date=None):
+    """Append today's (or snapshot_date's) changed prices from the cards table.
+
+    Returns the number of cards whose prices were recorded. Running it twice
+    for the same day records nothing the second time.
+    """
+    day = to_day(snapshot_date or date.today())
+    cur = conn.cursor()
+    create_price_tables(conn)
+
+    cur.execute("""
+    INSERT OR IGNORE INTO price_cards (card_id)
+    SELECT card_id FROM cards
+    WHERE price_usd IS NOT NULL OR price_eur IS NOT NULL OR price_tix IS NOT NULL
+    """)
+
+    # Today's prices in cents for every card we track
+    cur.execute("DROP TABLE IF EXISTS temp.price_snapshot")
+    cur.execute("""
+    CREATE TEMP TABLE price_snapshot AS
+    SELECT
+        pc.card_key,
+        CAST(ROUND(CAST(c.price_usd AS REAL) * 100) AS INTEGER) AS usd,
+        CAST(ROUND(CAST(c.price_eur AS REAL) * 100) AS INTEGER) AS eur,
+        CAST(ROUND(CAST(c.price_tix AS REAL) * 100) AS INTEGER) AS tix
+    FROM cards c
+    JOIN price_cards pc ON pc.card_id = c.card_id
+    """)
+
+    cur.execute("DROP TABLE IF EXISTS temp.price_changes")
+    cur.execute("""
+    CREATE TEMP TABLE price_changes AS
+    SELECT s.card_key, s.usd, s.eur, s.tix
+    FROM price_snapshot s
+    LEFT JOIN price_current p ON p.card_key = s.card_key
+    WHERE p.card_key IS NULL
+       OR s.usd IS NOT p.usd
+       OR s.eur IS NOT p.eur
+       OR s.tix IS NOT p.tix
+    """)
+
+    cur.execute("""
+    INSERT OR REPLACE INTO price_history (card_key, day, usd, eur, tix)
+    SELECT card_key, ?, usd, eur, tix FROM price_changes
+    """, (day,))
+    changed = cur.rowcount
+
+    cur.execute("""
+    INSERT OR REPLACE INTO price_current (card_key, day, usd, eur, tix)
+    SELECT card_key, ?, usd, eur, tix FROM price_changes
+    """, (day,))
+
+    cur.execute("DROP TABLE temp.price_snapshot")
+    cur.execute("DROP TABLE temp.price_changes")
+    conn.commit()
+    return changed
+
+def get_price_history(conn, card_id, start=None, end=None):
+    """(date, usd, eur, tix) rows for a card between ISO dates start and end.
+
+    Only days where a price changed are stored, so the first row is the last
+    change on or before `start` and each value holds until the next row.
+    """
+    return conn.execute(PRICE_HISTORY_QUERY, price_history_params(card_id, start, end)).fetchall()
+
+def biggest_movers(conn, since, currency="usd", limit=20, min_price=1.0):
+    """Cards with the largest absolute price change since the ISO date `since`"""
+    query, params = price_movers_query(since, currency, limit, min_price)
+    cur = conn.execute(query, params)
+    columns = [d[0] for d in cur.description]
+    return [dict(zip(columns, row)) for row in cur.fetchall()]
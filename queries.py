@@ -0,0 +1,178 @@
+"""SQL used by the Streamlit app, shared with benchmark.py"""
+
+SEARCH_TYPES = ["Name", "Type", "Oracle Text", "Set"]
+
+def quick_search_query(search_term, search_type):
+    """Build the Quick Search query and its parameters for a search type"""
+    pattern = f"%{search_term}%"
+
+    if search_type == "Name":
+        query = """
+            SELECT
+                COALESCE(json_extract(json, '$.image_uris.small'),
+                         json_extract(json, '$.card_faces[0].image_uris.small')) as image,
+                json_extract(json, '$.name') as name,
+                json_extract(json, '$.mana_cost') as mana_cost,
+                json_extract(json, '$.type_line') as type_line,
+                json_extract(json, '$.set') as set_code,
+                json_extract(json, '$.rarity') as rarity
+            FROM cards_raw
+            WHERE json_extract(json, '$.name') LIKE ?
+            ORDER BY json_extract(json, '$.name')
+            LIMIT 50
+        """
+        return query, (pattern,)
+    elif search_type == "Type":
+        query = """
+            SELECT
+                COALESCE(json_extract(json, '$.image_uris.small'),
+                         json_extract(json, '$.card_faces[0].image_uris.small')) as image,
+                json_extract(json, '$.name') as name,
+                json_extract(json, '$.mana_cost') as mana_cost,
+                json_extract(json, '$.type_line') as type_line,
+                json_extract(json, '$.set') as set_code
+            FROM cards_raw
+            WHERE json_extract(json, '$.type_line') LIKE ?
+            ORDER BY json_extract(json, '$.name')
+            LIMIT 50
+        """
+        return query, (pattern,)
+    elif search_type == "Oracle Text":
+        query = """
+            SELECT
+                COALESCE(json_extract(json, '$.image_uris.small'),
+                         json_extract(json, '$.card_faces[0].image_uris.small')) as image,
+                json_extract(json, '$.name') as name,
+                json_extract(json, '$.mana_cost') as mana_cost,
+                json_extract(json, '$.oracle_text') as oracle_text
+            FROM cards_raw
+            WHERE json_extract(json, '$.oracle_text') LIKE ?
+            ORDER BY json_extract(json, '$.name')
+            LIMIT 50
+        """
+        return query, (pattern,)
+    else:  # Set
+        query = """
+            SELECT
+                COALESCE(json_extract(json, '$.image_uris.small'),
+                         json_extract(json, '$.card_faces[0].image_uris.small')) as image,
+                json_extract(json, '$.name') as name,
+                json_extract(json, '$.mana_cost') as mana_cost,
+                json_extract(json, '$.set') as set_code,
+                json_extract(json, '$.set_name') as set_name
+            FROM cards_raw
+            WHERE json_extract(json, '$.set') LIKE ?
+               OR json_extract(json, '$.set_name') LIKE ?
+            ORDER BY json_extract(json, '$.name')
+            LIMIT 50
+        """
+        return query, (pattern, pattern)
+
+CARD_BY_NAME_QUERY = """
+    SELECT json FROM cards_raw
+    WHERE json_extract(json, '$.name') LIKE ?
+    LIMIT 1
+"""
+
+RULINGS_QUERY = """
+    SELECT published_at AS date, source, comment
+    FROM rulings
+    WHERE oracle_id = ?
+    ORDER BY published_at
+"""
+
+STATS_QUERY = """
+    SELECT
+        COUNT(*) as total_cards,
+        COUNT(DISTINCT json_extract(json, '$.set')) as total_sets,
+        COUNT(DISTINCT json_extract(json, '$.artist')) as total_artists
+    FROM cards_raw;
+"""
+
+RARITY_QUERY = """
+    SELECT
+        json_extract(json, '$.rarity') as rarity,
+        COUNT(*) as count
+    FROM cards_raw
+    WHERE json_extract(json, '$.rarity') IS NOT NULL
+    GROUP BY json_extract(json, '$.rarity')
+    ORDER BY count DESC;
+"""
+
+RECENT_SETS_QUERY = """
+    SELECT
+        json_extract(json, '$.set_name') as set_name,
+        json_extract(json, '$.set') as set_code,
+        json_extract(json, '$.released_at') as released_at,
+        COUNT(*) as card_count
+    FROM cards_raw
+    WHERE json_extract(json, '$.released_at') IS NOT NULL
+    GROUP BY json_extract(json, '$.set')
+    ORDER BY json_extract(json, '$.released_at') DESC
+    LIMIT 10;
+"""
+
+# Price history (see price_history.py); day numbers are days since 1970-01-01,
+# which is julian day 2440587.5
+PRICE_HISTORY_QUERY = """
+    SELECT
+        date(h.day + 2440587.5) as date,
+        h.usd / 100.0 as usd,
+        h.eur / 100.0 as eur,
+        h.tix / 100.0 as tix
+    FROM price_cards c
+    JOIN price_history h ON h.card_key = c.card_key
+    WHERE c.card_id = ?
+      AND h.day <= CAST(julianday(?) - 2440587.5 AS INTEGER)
+      AND h.day >= COALESCE((
+          SELECT MAX(p.day) FROM price_history p
+          WHERE p.card_key = c.card_key
+            AND p.day <= CAST(julianday(?) - 2440587.5 AS INTEGER)
+      ), 0)
+    ORDER BY h.day;
+"""
+
+def price_history_params(card_id, start=None, end=None):
+    """Parameters for PRICE_HISTORY_QUERY; start/end are ISO dates"""
+    return (card_id, end or "9999-12-31", start or "1970-01-01")
+
+PRICE_CURRENCIES = ["usd", "eur", "tix"]
+
+def price_movers_query(since, currency="usd", limit=20, min_price=1.0):
+    """Query and parameters for the cards whose price moved most since an ISO date"""
+    if currency not in PRICE_CURRENCIES:
+        raise ValueError(f"Unknown currency: {currency}")
+
+    query = f"""
+        WITH moves AS (
+            SELECT
+                cur.card_key,
+                cur.{currency} as now_cents,
+                (SELECT h.{currency} FROM price_history h
+                 WHERE h.card_key = cur.card_key
+                   AND h.day <= CAST(julianday(?) - 2440587.5 AS INTEGER)
+                 ORDER BY h.day DESC
+                 LIMIT 1) as then_cents
+            FROM price_current cur
+            WHERE cur.{currency} IS NOT NULL
+        )
+        SELECT
+            pc.card_id,
+            cards.name,
+            cards.set_code,
+            m.then_cents / 100.0 as price_then,
+            m.now_cents / 100.0 as price_now,
+            (m.now_cents - m.then_cents) / 100.0 as change,
+            ROUND(100.0 * (m.now_cents - m.then_cents) / m.then_cents, 1) as change_pct
+        FROM moves m
+        JOIN price_cards pc ON pc.card_key = m.card_key
+        LEFT JOIN cards ON cards.card_id = pc.card_id
+        WHERE m.then_cents IS NOT NULL
+          AND m.then_cents > 0
+          AND (m.then_cents >= ? OR m.now_cents >= ?)
+          AND m.now_cents != m.then_cents
+        ORDER BY ABS(m.now_cents - m.then_cents) DESC
+        LIMIT ?;
+    """
+    min_cents = int(round(min_price * 100))
+    return query, (since, min_cents, min_cents, limit)
@@ -0,0 +1,268 @@
+"""Instrumented SQLite query layer with an in-memory stats buffer and a bounded slow-query log.
+
+Every query run through execute() records its SQL fingerprint, wall time, rows
+returned, approximate SQLite VM steps and full-scan/sort counts. Python's
+sqlite3 module does not expose sqlite3_stmt_status(), so VM steps come from a
+progress handler and scan/sort counts from the statement's EXPLAIN QUERY PLAN.
+"""
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+
+# Queries slower than this are written to the slow_query_log table
+SLOW_QUERY_MS = 250
+# Maximum rows kept in slow_query_log; older entries are deleted
+SLOW_LOG_MAX_ROWS = 500
+# Recent executions kept in memory for percentile stats
+RECENT_MAX = 5000
+# The progress handler fires every PROGRESS_STEPS VM instructions
+PROGRESS_STEPS = 100
+PLAN_CACHE_SIZE = 256
+
+_recent = deque(maxlen=RECENT_MAX)
+_lock = threading.Lock()
+_plan_cache = OrderedDict()
+_local = threading.local()
+
+def fingerprint(sql):
+    """Normalize SQL so queries differing only in literals group together"""
+    text = re.sub(r"--[^\n]*", " ", sql)
+    text = re.sub(r"/\*.*?\*/", " ", text, flags=re.S)
+    # Replace string literals except JSON paths like '$.name', which identify the query
+    text = re.sub(r"'(?!\$)(?:[^']|'')*'", "?", text)
+    text = re.sub(r"\b\d+(?:\.\d+)?\b", "?", text)
+    text = re.sub(r"\s+", " ", text).strip().rstrip(";").strip()
+    return text
+
+def fingerprint_id(fp):
+    """Short stable id for a fingerprint"""
+    return hashlib.sha1(fp.encode("utf-8")).hexdigest()[:12]
+
+def query_plan(conn, sql, params=None):
+    """EXPLAIN QUERY PLAN output as indented text (cached per SQL string)"""
+    with _lock:
+        if sql in _plan_cache:
+            _plan_cache.move_to_end(sql)
+            return _plan_cache[sql]
+
+    try:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params or ()).fetchall()
+    except sqlite3.Error:
+        rows = []
+
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    plan = "\n".join(lines)
+
+    with _lock:
+        _plan_cache[sql] = plan
+        while len(_plan_cache) > PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    return plan
+
+def plan_counters(plan):
+    """(full_scans, sorts) counted from a query plan"""
+    full_scans = 0
+    sorts = 0
+    for line in plan.splitlines():
+        detail = line.strip()
+        if detail.startswith("SCAN "):
+            full_scans += 1
+        if detail.startswith("USE TEMP B-TREE"):
+            sorts += 1
+    return full_scans, sorts
+
+def execution_count():
+    """Number of queries actually executed by the current thread.
+
+    Wrappers around cached functions compare this before and after a call to
+    tell a cache hit (nothing executed) from a miss.
+    """
+    return getattr(_local, "executions", 0)
+
+def execute(db_path, sql, params=None, query_type="adhoc"):
+    """Run a query against db_path, record its metrics and return (columns, rows)"""
+    _local.executions = execution_count() + 1
+    record = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "query_type": query_type,
+        "fingerprint": fingerprint(sql),
+        "sql": sql.strip(),
+        "elapsed_ms": 0.0,
+        "rows": 0,
+        "vm_steps": 0,
+        "full_scans": 0,
+        "sorts": 0,
+        "cache_hit": False,
+        "error": None,
+    }
+    steps = [0]
+
+    def count_steps():
+        steps[0] += 1
+        return 0
+
+    conn = sqlite3.connect(db_path)
+    try:
+        plan = query_plan(conn, sql, params)
+        record["full_scans"], record["sorts"] = plan_counters(plan)
+        conn.set_progress_handler(count_steps, PROGRESS_STEPS)
+
+        start = time.perf_counter()
+        try:
+            cur = conn.execute(sql, params or ())
+            rows = cur.fetchall()
+        except Exception as e:
+            record["error"] = str(e)
+            raise
+        finally:
+            record["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            record["vm_steps"] = steps[0] * PROGRESS_STEPS
+            conn.set_progress_handler(None, 0)
+
+        columns = [d[0] for d in cur.description] if cur.description else []
+        record["rows"] = len(rows)
+        return columns, rows
+    finally:
+        conn.close()
+        _store(db_path, record, plan if record["elapsed_ms"] >= SLOW_QUERY_MS else None)
+
+def record_cache_hit(query_type, sql, elapsed_ms):
+    """Record a query that was answered from a cache without touching SQLite"""
+    fp = fingerprint(sql)
+    with _lock:
+        _recent.append({
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "query_type": query_type,
+            "fingerprint": fp,
+            "sql": sql.strip(),
+            "elapsed_ms": round(elapsed_ms, 3),
+            "rows": None,
+            "vm_steps": 0,
+            "full_scans": 0,
+            "sorts": 0,
+            "cache_hit": True,
+            "error": None,
+        })
+
+def _store(db_path, record, plan):
+    """Keep the record in memory and write it to the slow log if it was slow"""
+    with _lock:
+        _recent.append(record)
+
+    if plan is None:
+        return
+    try:
+        conn = sqlite3.connect(db_path)
+        ensure_slow_log(conn)
+        conn.execute("""
+            INSERT INTO slow_query_log
+                (logged_at, query_type, fingerprint_id, fingerprint, sql, elapsed_ms,
+                 rows_returned, vm_steps, full_scans, sorts, plan, error)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            record["timestamp"], record["query_type"], fingerprint_id(record["fingerprint"]),
+            record["fingerprint"], record["sql"], record["elapsed_ms"], record["rows"],
+            record["vm_steps"], record["full_scans"], record["sorts"], plan, record["error"],
+        ))
+        conn.execute("DELETE FROM slow_query_log WHERE id <= (SELECT MAX(id) FROM slow_query_log) - ?",
+                     (SLOW_LOG_MAX_ROWS,))
+        conn.commit()
+        conn.close()
+    except sqlite3.Error:
+        # Logging must never break the query that was logged (e.g. read-only databases)
+        pass
+
+def ensure_slow_log(conn):
+    """Create the slow_query_log table if needed"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS slow_query_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            logged_at TEXT,
+            query_type TEXT,
+            fingerprint_id TEXT,
+            fingerprint TEXT,
+            sql TEXT,
+            elapsed_ms REAL,
+            rows_returned INTEGER,
+            vm_steps INTEGER,
+            full_scans INTEGER,
+            sorts INTEGER,
+            plan TEXT,
+            error TEXT
+        )
+    """)
+
+def recent_records():
+    """Copy of the in-memory execution records, oldest first"""
+    with _lock:
+        return list(_recent)
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def latency_summary(records=None):
+    """Per-query-type latency percentiles and counters, slowest p95 first"""
+    if records is None:
+        records = recent_records()
+
+    by_type = {}
+    for record in records:
+        by_type.setdefault(record["query_type"], []).append(record)
+
+    summary = []
+    for query_type, group in by_type.items():
+        executed = [r for r in group if not r["cache_hit"]]
+        times = sorted(r["elapsed_ms"] for r in executed) or [0.0]
+        summary.append({
+            "query_type": query_type,
+            "calls": len(group),
+            "cache_hits": len(group) - len(executed),
+            "p50_ms": _percentile(times, 50),
+            "p90_ms": _percentile(times, 90),
+            "p95_ms": _percentile(times, 95),
+            "p99_ms": _percentile(times, 99),
+            "max_ms": times[-1],
+            "avg_rows": round(sum(r["rows"] for r in executed) / len(executed), 1) if executed else None,
+            "avg_vm_steps": round(sum(r["vm_steps"] for r in executed) / len(executed)) if executed else None,
+            "full_scans": sum(r["full_scans"] for r in executed),
+            "sorts": sum(r["sorts"] for r in executed),
+            "errors": sum(1 for r in executed if r["error"]),
+        })
+    summary.sort(key=lambda row: row["p95_ms"], reverse=True)
+    return summary
+
+def slow_queries(db_path, limit=20):
+    """Slowest logged queries as a list of dicts, slowest first"""
+    try:
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute("""
+            SELECT * FROM slow_query_log ORDER BY elapsed_ms DESC LIMIT ?
+        """, (limit,)).fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
+    except sqlite3.Error:
+        return []
+
+def clear(db_path=None):
+    """Forget in-memory records and, if db_path is given, empty the slow log"""
+    with _lock:
+        _recent.clear()
+    if db_path:
+        try:
+            conn = sqlite3.connect(db_path)
+            conn.execute("DELETE FROM slow_query_log")
+            conn.commit()
+            conn.close()
+        except sqlite3.Error:
+            pass
@@ -0,0 +1,134 @@
+"""Check that an interrupted build_db.py resumes to the same database as a clean build.
+
+Writes synthetic bulk files and builds them once without interruption. Then,
+for each trial, it starts build_db.py, kills it (SIGKILL, so nothing gets to
+clean up) at a random moment, and restarts it until a run completes. The
+finished database must match the clean one table by table, and each bulk
+file must have been read exactly once across the runs. Build metadata
+(build_info, build_state, sqlite_stat*) is expected to differ and is skipped.
+
+Usage:
+    python resume_check.py --cards 20000 --trials 5
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+BUILD_SCRIPT = os.path.join(REPO_DIR, "build_db.py")
+BULK_TYPES = ["default_cards", "all_cards", "rulings"]
+# Tables that record how and when a build ran rather than what it built
+SKIP_TABLES = {"build_info", "build_state"}
+MAX_ATTEMPTS = 50
+
+def build_command(workdir, db_name, chunk_rows):
+    return [sys.executable, BUILD_SCRIPT, "--types", *BULK_TYPES, "--skip-download",
+            "--bulk-dir", os.path.join(workdir, "bulk_data"), "--db", os.path.join(workdir, db_name),
+            "--chunk-rows", str(chunk_rows)]
+
+def table_digests(db_path):
+    """{table: (row_count, digest of its sorted rows)}, index names and ingest progress"""
+    conn = sqlite3.connect(db_path)
+    tables = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
+              if r[0] not in SKIP_TABLES and not r[0].startswith("sqlite_")]
+    digests = {}
+    for table in tables:
+        rows = sorted(repr(row) for row in conn.execute(f"SELECT * FROM {table}"))
+        digest = hashlib.sha256("\n".join(rows).encode("utf-8")).hexdigest()
+        digests[table] = (len(rows), digest)
+    indexes = {r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='index' AND name NOT LIKE 'sqlite_%'")}
+    # Objects read and rows added per ingest step; a chunk processed twice shows up here
+    # even when its inserts were ignored as duplicates
+    ingest = {step: (json.loads(detail)["objects"], json.loads(detail)["rows"])
+              for step, detail in conn.execute("SELECT step, detail FROM build_state WHERE step LIKE 'ingest:%'")}
+    conn.close()
+    return digests, indexes, ingest
+
+def interrupted_build(workdir, db_name, chunk_rows, max_delay, rng):
+    """Run builds, killing each at a random moment, until one finishes. Returns the kill delays."""
+    delays = []
+    for _ in range(MAX_ATTEMPTS):
+        delay = rng.uniform(0, max_delay)
+        proc = subprocess.Popen(build_command(workdir, db_name, chunk_rows),
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            proc.wait(timeout=delay)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            delays.append(round(delay, 2))
+            continue
+        if proc.returncode != 0:
+            raise RuntimeError(f"build_db.py failed with exit code {proc.returncode}")
+        return delays
+    # Never got a run through in time: let the last one finish
+    subprocess.run(build_command(workdir, db_name, chunk_rows), check=True, stdout=subprocess.DEVNULL)
+    return delays
+
+def compare(clean, resumed):
+    """Differences between two table_digests() results, as printable lines"""
+    (clean_tables, clean_indexes, clean_ingest), (tables, indexes, ingest) = clean, resumed
+    problems = []
+    for table in sorted(clean_tables.keys() | tables.keys()):
+        if clean_tables.get(table) != tables.get(table):
+            problems.append(f"table {table}: clean {clean_tables.get(table, ('missing',))[0]} rows, "
+                            f"resumed {tables.get(table, ('missing',))[0]} rows, contents differ")
+    if clean_indexes != indexes:
+        problems.append(f"indexes differ: {sorted(clean_indexes ^ indexes)}")
+    for step in sorted(clean_ingest):
+        if clean_ingest[step] != ingest.get(step):
+            problems.append(f"{step}: clean read {clean_ingest[step]}, resumed read {ingest.get(step)}")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Kill build_db.py at random points and check resumed builds")
+    parser.add_argument("--cards", type=int, default=20000, help="synthetic rows per bulk file")
+    parser.add_argument("--trials", type=int, default=5, help="interrupted builds to check")
+    parser.add_argument("--chunk-rows", type=int, default=2000, help="objects per committed ingest chunk")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", help="directory for bulk files and databases")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_DIR)
+    from synthetic_data import write_bulk_file
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="mtg-resume-")
+    os.makedirs(os.path.join(workdir, "bulk_data"), exist_ok=True)
+    print(f"Writing synthetic bulk files to {workdir}...")
+    for bulk_type in BULK_TYPES:
+        write_bulk_file(os.path.join(workdir, "bulk_data", f"{bulk_type}.json"), args.cards, args.seed, bulk_type)
+
+    print("Clean build...")
+    start = time.perf_counter()
+    subprocess.run(build_command(workdir, "clean.db", args.chunk_rows), check=True, stdout=subprocess.DEVNULL)
+    clean_seconds = time.perf_counter() - start
+    clean = table_digests(os.path.join(workdir, "clean.db"))
+    print(f"  {clean_seconds:.1f}s, tables: {', '.join(f'{t}={n:,}' for t, (n, _) in clean[0].items())}")
+
+    rng = random.Random(args.seed)
+    failures = 0
+    for trial in range(1, args.trials + 1):
+        db_name = f"trial{trial}.db"
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(os.path.join(workdir, db_name + suffix)):
+                os.remove(os.path.join(workdir, db_name + suffix))
+        delays = interrupted_build(workdir, db_name, args.chunk_rows, clean_seconds, rng)
+        problems = compare(clean, table_digests(os.path.join(workdir, db_name)))
+        failures += bool(problems)
+        print(f"Trial {trial}: killed {len(delays)} time(s) at {delays} s -> {'FAIL' if problems else 'ok'}")
+        for problem in problems:
+            print(f"  {problem}")
+
+    print(f"{args.trials - failures}/{args.trials} resumed builds matched the clean build")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
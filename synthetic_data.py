@@ -0,0 +1,407 @@
+"""Deterministic Scryfall-shaped card, ruling and Moxfield-shaped deck generator for offline benchmarks"""
+import json
+import random
+import uuid
+from datetime import date, timedelta
+
+COLORS = ["W", "U", "B", "R", "G"]
+RARITIES = ["common", "uncommon", "rare", "mythic"]
+RARITY_WEIGHTS = [55, 28, 14, 3]
+FORMATS = ["standard", "future", "historic", "timeless", "gladiator", "pioneer", "explorer",
+           "modern", "legacy", "pauper", "vintage", "penny", "commander", "oathbreaker",
+           "standardbrawl", "brawl", "alchemy", "paupercommander", "duel", "oldschool",
+           "premodern", "predh"]
+CARD_TYPES = ["Creature", "Instant", "Sorcery", "Artifact", "Enchantment", "Planeswalker", "Land"]
+TYPE_WEIGHTS = [40, 14, 12, 10, 10, 2, 12]
+SUBTYPES = ["Human", "Wizard", "Elf", "Goblin", "Zombie", "Dragon", "Angel", "Soldier",
+            "Merfolk", "Vampire", "Beast", "Spirit", "Knight", "Cleric", "Rogue"]
+KEYWORDS = ["Flying", "Trample", "Haste", "Vigilance", "Deathtouch", "Lifelink",
+            "Reach", "First strike", "Flash", "Menace", "Ward", "Hexproof"]
+NAME_PREFIXES = ["Ancient", "Blazing", "Crimson", "Dread", "Ethereal", "Feral", "Gilded",
+                 "Hollow", "Iron", "Jade", "Keen", "Lost", "Mystic", "Noble", "Obsidian",
+                 "Primal", "Quiet", "Radiant", "Shadow", "Thorned", "Umbral", "Vast",
+                 "Wild", "Zealous"]
+NAME_NOUNS = ["Bolt", "Counsel", "Drake", "Edict", "Familiar", "Growth", "Herald", "Insight",
+              "Juggernaut", "Knight", "Lotus", "Mentor", "Nexus", "Oracle", "Pact", "Quest",
+              "Ritual", "Sentinel", "Tutor", "Unraveling", "Visionary", "Wurm", "Zealot"]
+NAME_SUFFIXES = ["", "", "", " of the Wilds", " of Ages", " of Ruin", " of the Deep",
+                 " of Dawn", " of Dusk", " of the Forge"]
+ORACLE_PHRASES = ["Draw a card.", "Flying", "When this enters, draw a card.",
+                  "Destroy target creature.", "Counter target spell.",
+                  "Target player discards a card.", "Create a 1/1 white Soldier creature token.",
+                  "You gain 3 life.", "Deal 3 damage to any target.",
+                  "Search your library for a basic land card, put it onto the battlefield tapped, then shuffle.",
+                  "Return target creature to its owner's hand.", "Scry 2.",
+                  "Add one mana of any color.", "Each opponent loses 1 life."]
+ARTISTS = [f"Artist {i:03d}" for i in range(400)]
+# Real MTG has ~30k distinct oracle cards; capping keeps generator memory flat at 1M printings
+MAX_ORACLES = 35000
+BASIC_LANDS = {"W": "Plains", "U": "Island", "B": "Swamp", "R": "Mountain", "G": "Forest"}
+# Non-English languages in all_cards, weighted roughly by how many printings Scryfall has
+FOREIGN_LANGS = ["ja", "de", "fr", "it", "es", "pt", "zhs", "ru", "ko", "zht"]
+FOREIGN_WEIGHTS = [14, 12, 12, 11, 11, 10, 9, 8, 7, 6]
+RULING_COMMENTS = ["This ability triggers only once.", "The copy is not cast.",
+                   "If the target becomes illegal, the spell doesn't resolve.",
+                   "Damage is dealt simultaneously.", "This is a mana ability."]
+
+def _uuid(rng):
+    """Random UUID4 string drawn from rng so output is reproducible"""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+def _make_sets(rng, count):
+    """Build a list of fake set descriptors with release dates"""
+    sets = []
+    start = date(1993, 8, 5)
+    for i in range(count):
+        code = f"s{i:03d}"
+        sets.append({
+            "set_id": _uuid(rng),
+            "set": code,
+            "set_name": f"Synthetic Set {i:03d}",
+            "set_type": rng.choice(["expansion", "core", "masters", "commander", "draft_innovation"]),
+            "released_at": (start + timedelta(days=int(i * 11000 / max(count, 1)))).isoformat(),
+        })
+    return sets
+
+def _make_oracle(rng, index):
+    """Build the printing-independent part of a card (name, cost, rules text)"""
+    card_type = rng.choices(CARD_TYPES, TYPE_WEIGHTS)[0]
+    name = f"{rng.choice(NAME_PREFIXES)} {rng.choice(NAME_NOUNS)}{rng.choice(NAME_SUFFIXES)} {index}"
+
+    if card_type == "Land":
+        colors = []
+        mana_cost = ""
+        cmc = 0.0
+    else:
+        colors = sorted(rng.sample(COLORS, rng.choices([0, 1, 2, 3], [8, 60, 27, 5])[0]),
+                        key=COLORS.index)
+        generic = rng.randint(0, 5)
+        pips = "".join("{" + c + "}" for c in colors for _ in range(rng.randint(1, 2)))
+        mana_cost = ("{" + str(generic) + "}" if generic or not pips else "") + pips
+        cmc = float(generic + pips.count("{"))
+
+    type_line = card_type
+    if card_type == "Creature":
+        type_line = f"Creature — {rng.choice(SUBTYPES)}"
+
+    oracle = {
+        "oracle_id": _uuid(rng),
+        "name": name,
+        "mana_cost": mana_cost,
+        "cmc": cmc,
+        "type_line": type_line,
+        "oracle_text": " ".join(rng.sample(ORACLE_PHRASES, rng.randint(1, 3))),
+        "colors": colors,
+        "color_identity": colors,
+        "keywords": rng.sample(KEYWORDS, rng.randint(0, 2)),
+        "reserved": rng.random() < 0.01,
+        "game_changer": rng.random() < 0.005,
+        "edhrec_rank": rng.randint(1, 30000),
+        "legalities": {f: rng.choices(["legal", "not_legal", "banned", "restricted"], [70, 27, 2, 1])[0]
+                       for f in FORMATS},
+    }
+    if card_type == "Creature":
+        oracle["power"] = str(rng.randint(0, 8))
+        oracle["toughness"] = str(rng.randint(1, 8))
+    # Roughly 4% of cards are double-faced and carry their images on card_faces
+    oracle["double_faced"] = card_type == "Creature" and rng.random() < 0.04
+    return oracle
+
+def _image_uris(card_id, face=None):
+    """Scryfall-style image URL block for a card id"""
+    suffix = f"-{face}" if face else ""
+    base = f"https://cards.scryfall.io/{{size}}/front/{card_id[0]}/{card_id[1]}/{card_id}{suffix}.jpg"
+    return {
+        "small": base.format(size="small"),
+        "normal": base.format(size="normal"),
+        "large": base.format(size="large"),
+        "png": base.format(size="png").replace(".jpg", ".png"),
+        "art_crop": base.format(size="art_crop"),
+        "border_crop": base.format(size="border_crop"),
+    }
+
+def _price(rng, rarity):
+    """Random price string (or None) scaled by rarity"""
+    if rng.random() < 0.08:
+        return None
+    scale = {"common": 0.2, "uncommon": 0.5, "rare": 3.0, "mythic": 12.0}[rarity]
+    return f"{rng.expovariate(1 / scale):.2f}"
+
+def generate_cards(count, seed=42):
+    """Yield `count` Scryfall default_cards-shaped card dicts.
+
+    The same (count, seed) always yields the same cards, and the first N cards
+    for a seed do not depend on `count`.
+    """
+    rng = random.Random(seed)
+    sets = _make_sets(rng, 300)
+    oracles = []
+
+    for i in range(count):
+        # About a third of printings are reprints of an earlier oracle card
+        reprint = bool(oracles) and (len(oracles) >= MAX_ORACLES or rng.random() < 0.35)
+        if reprint:
+            oracle = rng.choice(oracles)
+        else:
+            oracle = _make_oracle(rng, len(oracles))
+            oracles.append(oracle)
+
+        card_set = rng.choice(sets)
+        card_id = _uuid(rng)
+        rarity = rng.choices(RARITIES, RARITY_WEIGHTS)[0]
+        card = {
+            "object": "card",
+            "id": card_id,
+            "oracle_id": oracle["oracle_id"],
+            "multiverse_ids": [rng.randint(1, 700000)],
+            "tcgplayer_id": rng.randint(1, 600000),
+            "cardmarket_id": rng.randint(1, 800000),
+            "name": oracle["name"],
+            "lang": "en",
+            "released_at": card_set["released_at"],
+            "uri": f"https://api.scryfall.com/cards/{card_id}",
+            "scryfall_uri": f"https://scryfall.com/card/{card_set['set']}/{i}/synthetic?utm_source=api",
+            "layout": "normal",
+            "highres_image": True,
+            "image_status": "highres_scan",
+            "cmc": oracle["cmc"],
+            "type_line": oracle["type_line"],
+            "color_identity": oracle["color_identity"],
+            "keywords": oracle["keywords"],
+            "legalities": oracle["legalities"],
+            "games": ["paper", "mtgo"],
+            "reserved": oracle["reserved"],
+            "game_changer": oracle["game_changer"],
+            "foil": rng.random() < 0.6,
+            "nonfoil": True,
+            "finishes": ["nonfoil", "foil"],
+            "oversized": False,
+            "promo": rng.random() < 0.05,
+            "reprint": reprint,
+            "variation": False,
+            "set_id": card_set["set_id"],
+            "set": card_set["set"],
+            "set_name": card_set["set_name"],
+            "set_type": card_set["set_type"],
+            "set_uri": f"https://api.scryfall.com/sets/{card_set['set_id']}",
+            "collector_number": str(i),
+            "digital": False,
+            "rarity": rarity,
+            "flavor_text": "Synthetic flavor text." if rng.random() < 0.4 else None,
+            "artist": rng.choice(ARTISTS),
+            "illustration_id": _uuid(rng),
+            "border_color": "black",
+            "frame": rng.choice(["1993", "1997", "2003", "2015"]),
+            "security_stamp": "oval",
+            "full_art": False,
+            "textless": False,
+            "booster": True,
+            "story_spotlight": False,
+            "edhrec_rank": oracle["edhrec_rank"],
+            "penny_rank": rng.randint(1, 15000),
+            "prices": {
+                "usd": _price(rng, rarity),
+                "usd_foil": _price(rng, rarity),
+                "usd_etched": None,
+                "eur": _price(rng, rarity),
+                "eur_foil": None,
+                "tix": _price(rng, "common"),
+            },
+            "related_uris": {
+                "gatherer": f"https://gatherer.wizards.com/Pages/Card/Details.aspx?multiverseid={i}",
+                "edhrec": f"https://edhrec.com/route/?cc={oracle['name'].replace(' ', '+')}",
+            },
+            "purchase_uris": {
+                "tcgplayer": f"https://www.tcgplayer.com/product/{i}",
+                "cardmarket": f"https://www.cardmarket.com/en/Magic/Products/Search?searchString={i}",
+                "cardhoarder": f"https://www.cardhoarder.com/cards/{i}",
+            },
+        }
+        if card["flavor_text"] is None:
+            del card["flavor_text"]
+
+        if oracle["double_faced"]:
+            card["layout"] = "transform"
+            card["card_faces"] = [
+                {
+                    "object": "card_face",
+                    "name": oracle["name"],
+                    "mana_cost": oracle["mana_cost"],
+                    "type_line": oracle["type_line"],
+                    "oracle_text": oracle["oracle_text"],
+                    "colors": oracle["colors"],
+                    "image_uris": _image_uris(card_id, "front"),
+                },
+                {
+                    "object": "card_face",
+                    "name": oracle["name"] + " Transformed",
+                    "mana_cost": "",
+                    "type_line": oracle["type_line"],
+                    "oracle_text": "Transformed side.",
+                    "colors": oracle["colors"],
+                    "image_uris": _image_uris(card_id, "back"),
+                },
+            ]
+        else:
+            card["image_uris"] = _image_uris(card_id)
+            card["mana_cost"] = oracle["mana_cost"]
+            card["oracle_text"] = oracle["oracle_text"]
+            card["colors"] = oracle["colors"]
+            if "power" in oracle:
+                card["power"] = oracle["power"]
+                card["toughness"] = oracle["toughness"]
+
+        yield card
+
+def generate_all_cards(count, seed=42):
+    """Yield `count` all_cards-shaped printings: English cards followed by translations.
+
+    About two thirds of English printings also get one to three non-English
+    printings with their own ids, as in Scryfall's all_cards file, and a few
+    printings exist only in another language (no English row at all).
+    """
+    rng = random.Random(seed + 1)
+    produced = 0
+    for card in generate_cards(count, seed):
+        if produced >= count:
+            return
+        if rng.random() < 0.02:
+            lang = rng.choices(FOREIGN_LANGS, FOREIGN_WEIGHTS)[0]
+            yield {**card, "lang": lang, "printed_name": f"{card['name']} ({lang})"}
+            produced += 1
+            continue
+        yield card
+        produced += 1
+        if rng.random() < 0.67:
+            for lang in rng.sample(FOREIGN_LANGS, rng.randint(1, 3)):
+                if produced >= count:
+                    return
+                card_id = _uuid(rng)
+                yield {**card, "id": card_id, "lang": lang, "printed_name": f"{card['name']} ({lang})",
+                       "uri": f"https://api.scryfall.com/cards/{card_id}"}
+                produced += 1
+
+def generate_rulings(count, seed=42):
+    """Yield Scryfall rulings-shaped dicts for the oracle cards among `count` printings"""
+    rng = random.Random(seed + 2)
+    seen = set()
+    for card in generate_cards(count, seed):
+        if card["oracle_id"] in seen:
+            continue
+        seen.add(card["oracle_id"])
+        # Most cards have no rulings; a few have several
+        for _ in range(rng.choices([0, 1, 2, 4], [60, 25, 10, 5])[0]):
+            yield {
+                "object": "ruling",
+                "oracle_id": card["oracle_id"],
+                "source": rng.choice(["wotc", "scryfall"]),
+                "published_at": (date(2004, 10, 4) + timedelta(days=rng.randint(0, 7000))).isoformat(),
+                "comment": rng.choice(RULING_COMMENTS),
+            }
+
+def write_json_array(path, items):
+    """Write dicts to `path` laid out like a Scryfall bulk file (one object per line)"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i, item in enumerate(items):
+            if i:
+                f.write(",\n")
+            f.write(json.dumps(item))
+        f.write("\n]\n")
+
+def write_bulk_file(path, count, seed=42, bulk_type="default_cards"):
+    """Write a synthetic Scryfall bulk file of the given type to `path`"""
+    generators = {"default_cards": generate_cards, "all_cards": generate_all_cards,
+                  "rulings": generate_rulings}
+    write_json_array(path, generators[bulk_type](count, seed))
+
+def _moxfield_card(card):
+    """Moxfield's embedded card object for a Scryfall card dict"""
+    faces = card.get("card_faces") or [card]
+    return {
+        "id": card["id"][:8],
+        "uniqueCardId": card["oracle_id"][:8],
+        "scryfall_id": card["id"],
+        "set": card["set"],
+        "set_name": card["set_name"],
+        "name": card["name"],
+        "cn": card["collector_number"],
+        "layout": card["layout"],
+        "cmc": card["cmc"],
+        "type_line": card["type_line"],
+        "mana_cost": faces[0].get("mana_cost", ""),
+        "oracle_text": faces[0].get("oracle_text", ""),
+        "colors": faces[0].get("colors", []),
+        "color_identity": card["color_identity"],
+        "legalities": card["legalities"],
+        "rarity": card["rarity"],
+        "prices": card["prices"],
+    }
+
+def generate_decks(count, card_pool, seed=42):
+    """Yield (deck_id, username, deck_data) tuples shaped like Moxfield's v2 deck API.
+
+    `card_pool` is a list of Scryfall card dicts (e.g. the first few thousand
+    from generate_cards with the same seed) that decks draw their cards from.
+    """
+    rng = random.Random(seed + 1)
+    nonlands = [c for c in card_pool if "Land" not in c["type_line"]]
+    usernames = [f"synthetic_user_{i:02d}" for i in range(20)]
+
+    for i in range(count):
+        deck_id = f"deck{i:06d}{rng.getrandbits(32):08x}"
+        username = rng.choice(usernames)
+        deck_format = rng.choice(["commander", "modern", "standard", "pioneer", "legacy"])
+        is_commander = deck_format == "commander"
+
+        commanders = {}
+        if is_commander:
+            commander = rng.choice([c for c in nonlands if "Creature" in c["type_line"]] or nonlands)
+            commanders[commander["name"]] = {"quantity": 1, "boardType": "commanders",
+                                             "finish": "nonFoil", "isFoil": False,
+                                             "card": _moxfield_card(commander)}
+
+        mainboard = {}
+        spell_slots = 63 if is_commander else 36
+        for card in rng.sample(nonlands, min(spell_slots, len(nonlands))):
+            quantity = 1 if is_commander else rng.choice([1, 2, 3, 4])
+            mainboard[card["name"]] = {"quantity": quantity, "boardType": "mainboard",
+                                       "finish": "nonFoil", "isFoil": False,
+                                       "card": _moxfield_card(card)}
+
+        land_colors = {c for card in mainboard.values() for c in card["card"]["colors"]} or {"W"}
+        land_slots = 36 if is_commander else 24
+        for n, color in enumerate(sorted(land_colors)):
+            share = land_slots // len(land_colors) + (1 if n < land_slots % len(land_colors) else 0)
+            name = BASIC_LANDS[color]
+            mainboard[name] = {"quantity": share, "boardType": "mainboard", "finish": "nonFoil",
+                               "isFoil": False,
+                               "card": {"id": name.lower(), "scryfall_id": None, "name": name,
+                                        "cmc": 0, "type_line": f"Basic Land — {name}",
+                                        "mana_cost": "", "colors": [], "color_identity": [color],
+                                        "legalities": {f: "legal" for f in FORMATS},
+                                        "prices": {"usd": "0.10"}}}
+
+        created = date(2020, 1, 1) + timedelta(days=rng.randint(0, 2000))
+        yield deck_id, username, {
+            "id": deck_id,
+            "name": f"Synthetic Deck {i}",
+            "description": "",
+            "format": deck_format,
+            "visibility": "public",
+            "publicUrl": f"https://moxfield.com/decks/{deck_id}",
+            "publicId": deck_id,
+            "likeCount": rng.randint(0, 500),
+            "viewCount": rng.randint(0, 20000),
+            "createdByUser": {"userName": username},
+            "createdAtUtc": created.isoformat() + "T00:00:00.000Z",
+            "lastUpdatedAtUtc": (created + timedelta(days=rng.randint(0, 300))).isoformat() + "T00:00:00.000Z",
+            "mainboardCount": sum(c["quantity"] for c in mainboard.values()),
+            "mainboard": mainboard,
+            "sideboardCount": 0,
+            "sideboard": {},
+            "commandersCount": len(commanders),
+            "commanders": commanders,
+            "tokens": [],
+            "hubs": [],
+        }